@@ -0,0 +1,182 @@
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from rollups import bucket_start
+
+HOURS_PER_WEEK = 7 * 24
+ALL_SENTIMENTS = 'all'
+ALL_PLATFORMS = 'All platforms'
+
+
+def poisson_z(count, rate):
+    """Standard normal z with the same upper tail as P(X >= count) for
+    X ~ Poisson(rate), by the Wilson-Hilferty approximation; +inf (no
+    bound) where count is 0"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = 3 * np.sqrt(count) * (1 - 1 / (9 * count) - np.cbrt(rate / count))
+    return np.where(count > 0, z, np.inf)
+
+
+class VolumeAnomalyDetector:
+    """Flags hours whose mention volume is far above its seasonal baseline.
+
+    Works on the hourly rollups. Each (platform, sentiment) series, plus
+    each platform's total and the grand total, is laid out as a
+    weeks x hour-of-week matrix. The baseline for an hour is the EWMA of
+    the same hour of the week in previous weeks. Its scale is the EWMA of
+    those weeks' absolute residuals, floored at the Poisson spread of the
+    baseline (or of the steadier hour-of-day level, if higher) widened by
+    the baseline's estimation variance over its effective weeks of history.
+    Small counts are also held to the Poisson upper tail, so a few quiet
+    weeks don't make an ordinary hour look extreme. Hours scoring
+    z >= ANOMALY_Z_THRESHOLD with at least ANOMALY_MIN_COUNT mentions are
+    anomalies.
+
+    All series and all hours are scored at once with a few matrix
+    products. Every baseline uses only earlier weeks, so the same scoring
+    doubles as a backtest over the stored history. Only rises are flagged,
+    since drops usually mean a source is down.
+    """
+
+    def __init__(self, z_threshold=None, smoothing=None, min_history_weeks=None, min_count=None, clock=time.time):
+        self.z_threshold = z_threshold or Config.ANOMALY_Z_THRESHOLD
+        self.smoothing = smoothing or Config.ANOMALY_SEASONAL_SMOOTHING
+        self.min_history_weeks = min_history_weeks or Config.ANOMALY_MIN_HISTORY_WEEKS
+        self.min_count = min_count or Config.ANOMALY_MIN_COUNT
+        self.clock = clock
+
+    def _series(self, rollups, now):
+        """(keys, first hour, counts[key, hour], observed[hour]) for the hourly buckets"""
+        hours = rollups.columns['bucket']
+        first = bucket_start(int(hours.min()), 'week')
+        last = max(bucket_start(now, 'hour'), int(hours.max()))
+        length = ((last - first) // 3600 // HOURS_PER_WEEK + 1) * HOURS_PER_WEEK
+        positions = (hours - first) // 3600
+
+        pairs = pd.MultiIndex.from_arrays([rollups.columns['platform'], rollups.columns['sentiment']])
+        pair_codes, pair_keys = pd.factorize(pairs, sort=True)
+        platform_codes, platform_keys = pd.factorize(rollups.columns['platform'], sort=True)
+        keys = list(pair_keys) + [(platform, ALL_SENTIMENTS) for platform in platform_keys] + [(ALL_PLATFORMS, ALL_SENTIMENTS)]
+
+        counts = np.zeros((len(keys), length))
+        np.add.at(counts, (pair_codes, positions), rollups.columns['count'])
+        np.add.at(counts, (len(pair_keys) + platform_codes, positions), rollups.columns['count'])
+        counts[-1] = counts[len(pair_keys):-1].sum(axis=0)
+
+        # Hours before the first bucket or after now hold no observation, not zero mentions
+        observed = np.zeros(length, dtype=bool)
+        observed[positions.min():(last - first) // 3600 + 1] = True
+        return keys, first, counts, observed
+
+    def score(self, rollups, platforms=None, now=None):
+        """Score every hour of every series.
+
+        Returns a dict with `keys` [(platform, sentiment)], `hours` (epoch
+        start of each hour) and [key, hour] arrays `count`, `expected`, `z`
+        and `anomaly`.
+        """
+        now = now or self.clock()
+        if platforms is not None:
+            rollups = rollups.filter(platforms=platforms)
+        if not len(rollups):
+            return None
+
+        keys, first, counts, observed = self._series(rollups, now)
+        weeks = counts.shape[1] // HOURS_PER_WEEK
+        values = counts.reshape(len(keys), weeks, HOURS_PER_WEEK)
+        observed = observed.reshape(weeks, HOURS_PER_WEEK).astype(float)
+
+        # decay[t, k] weighs week k in the baseline of week t (earlier weeks only)
+        lag = np.arange(weeks)[:, None] - np.arange(weeks)[None, :] - 1
+        decay = np.where(lag >= 0, (1 - self.smoothing) ** np.maximum(lag, 0), 0.0)
+        history_weeks = (lag >= 0).astype(float) @ observed
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = decay @ observed
+            expected = np.einsum('tk,nkh->nth', decay, values * observed) / weight
+            residual_observed = observed * (history_weeks > 0)
+            spread = np.einsum('tk,nkh->nth', decay, np.abs(values - np.nan_to_num(expected)) * residual_observed)
+            spread /= decay @ residual_observed
+            # Effective number of independent weeks behind each EWMA baseline
+            effective_weeks = weight ** 2 / ((decay ** 2) @ observed)
+            # Same hour of the day over all seven days: a steadier level than a few weeks of one hour
+            daily = np.einsum('tk,nkh->nth', decay, (values * observed).reshape(len(keys), weeks, 7, 24).sum(axis=2))
+            daily /= decay @ observed.reshape(weeks, 7, 24).sum(axis=1)
+        expected = np.nan_to_num(expected)
+        spread = np.nan_to_num(spread)
+        hour_of_day = np.tile(np.nan_to_num(daily), 7)
+        estimation = 1 + 1 / np.maximum(np.nan_to_num(effective_weeks), 1.0)
+
+        # The current hour is still filling up: expect only its elapsed share
+        current = (bucket_start(now, 'hour') - first) // 3600
+        elapsed = np.ones(weeks * HOURS_PER_WEEK)
+        if current < len(elapsed):
+            elapsed[current] = min(max((now - bucket_start(now, 'hour')) / 3600, 0.25), 1.0)
+        elapsed = elapsed.reshape(weeks, HOURS_PER_WEEK)
+        expected = expected * elapsed
+        spread = spread * elapsed
+
+        # Poisson variance at the baseline, or the hour-of-day level if higher,
+        # grown by the baseline's own estimation variance (rate / effective weeks)
+        rate = np.maximum(expected, hour_of_day * elapsed) * estimation
+        # Mean absolute deviation x 1.2533 estimates a normal standard deviation
+        sigma = np.maximum(np.maximum(1.2533 * spread, np.sqrt(rate)), 1.0)
+        # Small counts have a longer upper tail than the normal: take the
+        # Poisson tail's z where it is lower
+        z = np.minimum((values - expected) / sigma, poisson_z(values, rate))
+        scored = (observed > 0) & (history_weeks >= self.min_history_weeks)
+        anomaly = scored & (z >= self.z_threshold) & (values >= self.min_count)
+
+        shape = (len(keys), weeks * HOURS_PER_WEEK)
+        return {
+            'keys': keys,
+            'hours': first + np.arange(weeks * HOURS_PER_WEEK) * 3600,
+            'count': values.reshape(shape),
+            'expected': expected.reshape(shape),
+            'z': np.where(scored, z, np.nan).reshape(shape),
+            'anomaly': anomaly.reshape(shape)
+        }
+
+    def backtest(self, rollups, platforms=None, now=None):
+        """Every anomalous (hour, series) in the stored history, as a DataFrame"""
+        scores = self.score(rollups, platforms, now)
+        columns = ['hour', 'platform', 'sentiment', 'count', 'expected', 'z']
+        if scores is None:
+            return pd.DataFrame(columns=columns)
+        series, positions = np.nonzero(scores['anomaly'])
+        return pd.DataFrame({
+            'hour': pd.to_datetime([datetime.fromtimestamp(hour) for hour in scores['hours'][positions]]),
+            'platform': [scores['keys'][i][0] for i in series],
+            'sentiment': [scores['keys'][i][1] for i in series],
+            'count': scores['count'][series, positions].astype(int),
+            'expected': scores['expected'][series, positions],
+            'z': scores['z'][series, positions]
+        }, columns=columns).sort_values(['hour', 'z'], ascending=[True, False]).reset_index(drop=True)
+
+    def alert(self, rollups, platforms=None, now=None):
+        """Strongest anomaly in the current or last complete hour, as an alert dict, or None"""
+        now = now or self.clock()
+        scores = self.score(rollups, platforms, now)
+        if scores is None:
+            return None
+        current = int(np.searchsorted(scores['hours'], bucket_start(now, 'hour')))
+        recent = slice(max(current - 1, 0), current + 1)
+        z = np.where(scores['anomaly'][:, recent], scores['z'][:, recent], -np.inf)
+        if not np.isfinite(z).any():
+            return None
+
+        series, offset = np.unravel_index(np.argmax(z), z.shape)
+        position = recent.start + offset
+        platform, sentiment = scores['keys'][series]
+        return {
+            'type': 'volume_anomaly',
+            'platform': platform,
+            'sentiment': sentiment,
+            'hour': datetime.fromtimestamp(scores['hours'][position]),
+            'count': int(scores['count'][series, position]),
+            'expected': float(scores['expected'][series, position]),
+            'z': float(scores['z'][series, position])
+        }
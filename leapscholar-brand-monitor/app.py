@@ -13,6 +13,13 @@ import re
 from sentiment_analyzer import SentimentAnalyzer
 from data_collector import DataCollector
 from digest_generator import DigestGenerator
+from collector_worker import read_status
+from refresher import BackgroundRefresher
+from mention_frame import MentionFrame
+from snapshot import MentionSnapshot, SnapshotPublisher
+from rollups import RESOLUTIONS
+from anomaly_detector import ALL_PLATFORMS, ALL_SENTIMENTS, VolumeAnomalyDetector
+from config import Config
 
 # Page configuration
 st.set_page_config(
@@ -467,9 +474,11 @@ st.markdown("""
 # Initialize components
 @st.cache_resource
 def initialize_components():
-    return SentimentAnalyzer(), DataCollector(), DigestGenerator()
+    analyzer = SentimentAnalyzer()
+    return analyzer, DataCollector(analyzer=analyzer), DigestGenerator()
 
 sentiment_analyzer, data_collector, digest_generator = initialize_components()
+volume_anomaly_detector = VolumeAnomalyDetector()
 
 # Main header
 st.markdown('<h1 class="main-header">🎓 LeapScholar Brand Perception Monitor</h1>', unsafe_allow_html=True)
@@ -481,10 +490,19 @@ st.sidebar.markdown("---")
 # Time range selector
 time_range = st.sidebar.selectbox(
     "📅 Time Range",
-    ["Last 24 Hours", "Last 7 Days", "Last 30 Days"],
+    ["Last 24 Hours", "Last 7 Days", "Last 30 Days", "Last 90 Days", "Last 12 Months", "Custom Range"],
     index=1
 )
 
+custom_dates = None
+if time_range == "Custom Range":
+    today = datetime.now().date()
+    custom_dates = st.sidebar.date_input(
+        "Date range",
+        value=(today - timedelta(days=7), today),
+        max_value=today
+    )
+
 # Platform filter
 platforms = st.sidebar.multiselect(
     "🌐 Platforms",
@@ -493,35 +511,124 @@ platforms = st.sidebar.multiselect(
 )
 
 # Refresh button
-if st.sidebar.button("🔄 Refresh Data"):
-    st.rerun()
-
-# Load data
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def load_mentions_data():
-    return data_collector.get_all_mentions()
+refresh_requested = st.sidebar.button("🔄 Refresh Data")
 
-mentions_data = load_mentions_data()
-
-# Filter data based on sidebar selections
-def filter_data(data, time_range, platforms):
+def get_cutoff_time(time_range):
     current_time = datetime.now()
     
     if time_range == "Last 24 Hours":
-        cutoff_time = current_time - timedelta(days=1)
+        return current_time - timedelta(days=1)
     elif time_range == "Last 7 Days":
-        cutoff_time = current_time - timedelta(days=7)
+        return current_time - timedelta(days=7)
+    elif time_range == "Last 90 Days":
+        return current_time - timedelta(days=90)
+    elif time_range == "Last 12 Months":
+        return current_time - timedelta(days=365)
     else:  # Last 30 Days
-        cutoff_time = current_time - timedelta(days=30)
+        return current_time - timedelta(days=30)
+
+def get_time_bounds(time_range, custom_dates=None):
+    """(start, end) of the selected range; end is None for ranges up to now"""
+    if time_range != "Custom Range":
+        return get_cutoff_time(time_range), None
     
-    filtered_data = [
-        mention for mention in data
-        if mention['timestamp'] >= cutoff_time and mention['platform'] in platforms
-    ]
+    # The date picker returns a single date until both ends are chosen
+    dates = tuple(custom_dates) if isinstance(custom_dates, (list, tuple)) else (custom_dates,)
+    start_date = dates[0]
+    end_date = dates[-1]
+    start = datetime.combine(start_date, datetime.min.time())
+    end = datetime.combine(end_date, datetime.min.time()) + timedelta(days=1)
+    return start, end
+
+# One refresher per server process, shared by every session. Sessions get a
+# reference to the same immutable snapshot, replaced only when the data changes.
+@st.cache_resource
+def get_snapshot_refresher():
+    publisher = SnapshotPublisher(data_collector.store)
+    
+    def refresh_snapshot():
+        if not Config.EXTERNAL_COLLECTOR:
+            data_collector.collect_new_mentions()
+            data_collector.store.apply_retention()
+        return publisher.refresh()
     
-    return filtered_data
+    return BackgroundRefresher(refresh_snapshot, Config.CACHE_DURATION_MINUTES * 60)
+
+snapshot_refresher = get_snapshot_refresher()
+if refresh_requested:
+    snapshot_refresher.refresh_async()
+
+# Load data: serve the last good snapshot, refreshing it in the background once stale
+def load_mentions_data():
+    snapshot = snapshot_refresher.get()
+    if snapshot is None:
+        snapshot = MentionSnapshot(MentionFrame.empty(), version=None)
+    return snapshot
+
+snapshot = load_mentions_data()
+if st.session_state.get('snapshot_version', snapshot.version) != snapshot.version:
+    st.toast("🆕 New mentions loaded")
+st.session_state['snapshot_version'] = snapshot.version
+
+snapshot_age = snapshot_refresher.age()
+if snapshot_age is not None:
+    st.sidebar.caption(f"🕒 Data snapshot is {int(snapshot_age // 60)} min old")
+if snapshot_refresher.refreshing:
+    st.sidebar.caption("🔄 Refreshing data in the background...")
+if snapshot_refresher.last_error is not None:
+    st.sidebar.warning(f"⚠️ Showing last good data; refresh failed: {snapshot_refresher.last_error}")
+
+# Collection status comes from the background worker when one is running
+if Config.EXTERNAL_COLLECTOR:
+    worker_status = read_status() or {}
+    collection_status = worker_status.get('sources') or {}
+    dedup_report = worker_status.get('dedup') or {}
+    if worker_status.get('last_run_finished'):
+        last_run = datetime.fromisoformat(worker_status['last_run_finished'])
+        minutes_ago = int((datetime.now() - last_run).total_seconds() // 60)
+        st.sidebar.caption(f"🛰️ Last collected {minutes_ago} min ago by the background worker")
+    else:
+        st.sidebar.info("🛰️ Waiting for the background collector's first run")
+    if worker_status.get('ok') is False:
+        st.sidebar.error(f"❌ Last collection failed: {worker_status.get('error')}")
+else:
+    collection_status = data_collector.last_collection_status
+    dedup_report = data_collector.last_dedup_report
+
+# Warn when the last collection came back partial
+failed_sources = [
+    name for name, status in collection_status.items()
+    if status['status'] != 'ok'
+]
+if failed_sources:
+    st.sidebar.warning(f"⚠️ Partial data: no response from {', '.join(failed_sources)}")
+
+dropped_duplicates = dedup_report.get('dropped', 0)
+if dropped_duplicates:
+    st.sidebar.caption(f"🧹 {dropped_duplicates} duplicate mentions dropped in the last collection")
+
+# Filter data based on sidebar selections: raw mentions for the mention-level
+# tabs, plus rollups at the coarsest tier that still fills the trend chart
+def filter_data(snapshot, time_range, platforms, custom_dates=None):
+    start, end = get_time_bounds(time_range, custom_dates)
+    resolution = snapshot.rollups.resolution_for(start, end)
+    rollups = snapshot.rollups.between(start=start, end=end, platforms=platforms, resolution=resolution)
+    if snapshot.index.covers(start):
+        mentions = snapshot.index.select(start=start, end=end, platforms=platforms)
+    else:
+        # Longer ranges are read from the store, back to the compaction horizon
+        mentions = data_collector.store.query_frame(start=start, end=end, platforms=platforms)
+    return mentions, rollups
 
-filtered_mentions = filter_data(mentions_data, time_range, platforms)
+filtered_mentions, filtered_rollups = filter_data(snapshot, time_range, platforms, custom_dates)
+
+compacted_before = data_collector.store.compacted_before()
+if compacted_before is not None and get_time_bounds(time_range, custom_dates)[0].timestamp() < compacted_before:
+    st.sidebar.caption(
+        f"🗜️ Individual mentions are kept since {datetime.fromtimestamp(compacted_before):%b %d, %Y}; "
+        "older periods appear in the metrics and charts only"
+    )
+sentiment_totals = filtered_rollups.sentiment_totals()
 
 # Top Metrics Section
 st.markdown('<div class="section-header">📊 Key Metrics Overview</div>', unsafe_allow_html=True)
@@ -530,7 +637,7 @@ col1, col2, col3, col4 = st.columns(4)
 
 # Key metrics with improved styling
 with col1:
-    total_mentions = len(filtered_mentions)
+    total_mentions = int(filtered_rollups.total())
     st.markdown(f"""
     <div class="metric-item-large">
         <div class="metric-value-large">{total_mentions}</div>
@@ -539,7 +646,7 @@ with col1:
     """, unsafe_allow_html=True)
 
 with col2:
-    positive_mentions = len([m for m in filtered_mentions if m['sentiment'] == 'positive'])
+    positive_mentions = int(sentiment_totals.get('positive', 0))
     st.markdown(f"""
     <div class="metric-item-large">
         <div class="metric-value-large" style="color: #48bb78;">{positive_mentions}</div>
@@ -548,7 +655,7 @@ with col2:
     """, unsafe_allow_html=True)
 
 with col3:
-    negative_mentions = len([m for m in filtered_mentions if m['sentiment'] == 'negative'])
+    negative_mentions = int(sentiment_totals.get('negative', 0))
     st.markdown(f"""
     <div class="metric-item-large">
         <div class="metric-value-large" style="color: #f56565;">{negative_mentions}</div>
@@ -557,7 +664,9 @@ with col3:
     """, unsafe_allow_html=True)
 
 with col4:
-    pulse_score = sentiment_analyzer.calculate_brand_pulse_score(filtered_mentions)
+    pulse_score = sentiment_analyzer.pulse_score_from_counts(
+        total_mentions, positive_mentions, int(filtered_rollups.total('influencer_count'))
+    )
     st.markdown(f"""
     <div class="pulse-score">
         <div class="pulse-value">{pulse_score:.1f}</div>
@@ -565,16 +674,30 @@ with col4:
     </div>
     """, unsafe_allow_html=True)
 
-# Alert for sentiment spikes
-spike_alert = data_collector.detect_spikes(filtered_mentions)
+# Alerts for sentiment spikes and for mention volume far above this hour's usual level
+spike_alert = snapshot.spike_detector.alert(platforms=platforms)
+volume_alert = volume_anomaly_detector.alert(snapshot.rollups.tiers['hour'], platforms=platforms)
+alert_messages = []
 if spike_alert:
-    alert_class = "positive" if spike_alert['type'] == 'positive_spike' else ""
     alert_emoji = "🎉" if spike_alert['type'] == 'positive_spike' else "🚨"
-    st.markdown(f"""
-    <div class="alert-box {alert_class}">
+    alert_messages.append(f"""
         <strong>{alert_emoji} SENTIMENT SPIKE DETECTED!</strong><br>
-        {spike_alert['percentage']:.1f}% of recent mentions are {spike_alert['type'].replace('_', ' ')} 
+        {spike_alert['percentage']:.1f}% of mentions in the last {spike_alert['window_hours']}h are {spike_alert['type'].replace('_', ' ')} 
         ({spike_alert['count']} out of {spike_alert['total']} mentions)
+    """)
+if volume_alert:
+    sentiment_label = "" if volume_alert['sentiment'] == ALL_SENTIMENTS else f"{volume_alert['sentiment']} "
+    platform_label = "across all platforms" if volume_alert['platform'] == ALL_PLATFORMS else f"on {volume_alert['platform']}"
+    alert_messages.append(f"""
+        <strong>📈 UNUSUAL MENTION VOLUME!</strong><br>
+        {volume_alert['count']} {sentiment_label}mentions {platform_label} in the hour from {volume_alert['hour']:%H:%M},
+        against about {volume_alert['expected']:.0f} usual for this hour of the week (z = {volume_alert['z']:.1f})
+    """)
+if alert_messages:
+    alert_class = "positive" if spike_alert and spike_alert['type'] == 'positive_spike' and not volume_alert else ""
+    st.markdown(f"""
+    <div class="alert-box {alert_class}">
+        {'<br><br>'.join(alert_messages)}
     </div>
     """, unsafe_allow_html=True)
 
@@ -591,12 +714,12 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs([
 with tab1:
     st.markdown('<div class="section-header">📊 Brand Sentiment Overview</div>', unsafe_allow_html=True)
     
-    if filtered_mentions:
+    if total_mentions:
         # Sentiment distribution pie chart
-        sentiment_counts = pd.DataFrame([
-            {'sentiment': mention['sentiment'], 'count': 1} 
-            for mention in filtered_mentions
-        ]).groupby('sentiment').count().reset_index()
+        sentiment_counts = pd.DataFrame(
+            list(sentiment_totals.items()),
+            columns=['sentiment', 'count']
+        )
         
         fig_pie = px.pie(
             sentiment_counts, 
@@ -619,14 +742,11 @@ with tab1:
         st.plotly_chart(fig_pie, use_container_width=True)
         
         # Sentiment over time
-        df_time = pd.DataFrame(filtered_mentions)
-        df_time['date'] = pd.to_datetime(df_time['timestamp']).dt.date
-        
-        daily_sentiment = df_time.groupby(['date', 'sentiment']).size().reset_index(name='count')
+        sentiment_series = filtered_rollups.series()
         
         fig_line = px.line(
-            daily_sentiment,
-            x='date',
+            sentiment_series,
+            x='time',
             y='count',
             color='sentiment',
             color_discrete_map={
@@ -643,9 +763,41 @@ with tab1:
         )
         st.plotly_chart(fig_line, use_container_width=True)
         
+        # Brand Pulse Score per bucket, overall and per platform
+        pulse_resolutions = RESOLUTIONS[:RESOLUTIONS.index(filtered_rollups.resolution) + 1]
+        pulse_labels = {'hour': "Hourly", 'day': "Daily", 'week': "Weekly"}
+        pulse_resolution = st.radio(
+            "Pulse granularity",
+            pulse_resolutions,
+            index=len(pulse_resolutions) - 1,
+            format_func=pulse_labels.get,
+            horizontal=True
+        )
+        pulse_overall = sentiment_analyzer.calculate_pulse_series(filtered_rollups, pulse_resolution)
+        pulse_overall['platform'] = "All selected"
+        pulse_series = pd.concat([
+            pulse_overall,
+            sentiment_analyzer.calculate_pulse_series(filtered_rollups, pulse_resolution, by_platform=True)
+        ])
+        
+        fig_pulse = px.line(
+            pulse_series,
+            x='time',
+            y='pulse_score',
+            color='platform',
+            title="Brand Pulse Score Over Time"
+        )
+        fig_pulse.update_layout(
+            height=400,
+            title_x=0.5,
+            font=dict(size=14),
+            yaxis_range=[0, 100]
+        )
+        st.plotly_chart(fig_pulse, use_container_width=True)
+        
         # Mood meter
         st.markdown('<div class="section-header">😊 Current Brand Mood</div>', unsafe_allow_html=True)
-        avg_sentiment = np.mean([m['compound_score'] for m in filtered_mentions])
+        avg_sentiment = filtered_rollups.total('compound_sum') / max(total_mentions, 1)
         
         if avg_sentiment > 0.3:
             mood_emoji = "😊"
@@ -686,11 +838,11 @@ with tab2:
     
     if filtered_mentions:
         # Get top mentions by engagement
-        top_mentions = sorted(filtered_mentions, key=lambda x: x['engagement'], reverse=True)[:10]
+        top_mentions = filtered_mentions.take(filtered_mentions.top('engagement', 10))
         
         # Separate positive and negative high-impact mentions
-        high_positive = [m for m in top_mentions if m['sentiment'] == 'positive'][:5]
-        high_negative = [m for m in top_mentions if m['sentiment'] == 'negative'][:5]
+        high_positive = top_mentions.filter(sentiments=['positive']).to_records()[:5]
+        high_negative = top_mentions.filter(sentiments=['negative']).to_records()[:5]
         
         col1, col2 = st.columns(2)
         
@@ -764,7 +916,7 @@ with tab3:
     
     if filtered_mentions:
         # Extract keywords from mentions
-        all_text = " ".join([mention['text'].lower() for mention in filtered_mentions])
+        all_text = " ".join(filtered_mentions['text']).lower()
         
         # Remove common words and extract keywords
         stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his', 'her', 'its', 'our', 'their', 'mine', 'yours', 'his', 'hers', 'ours', 'theirs'}
@@ -819,35 +971,33 @@ with tab4:
     
     if filtered_mentions:
         # Group by username and calculate metrics
-        influencer_data = {}
-        for mention in filtered_mentions:
-            username = mention['username']
-            if username not in influencer_data:
-                influencer_data[username] = {
-                    'mentions': 0,
-                    'total_engagement': 0,
-                    'followers': mention.get('followers_count', 0),
-                    'platforms': set(),
-                    'sentiment_scores': []
-                }
-            
-            influencer_data[username]['mentions'] += 1
-            influencer_data[username]['total_engagement'] += mention['engagement']
-            influencer_data[username]['platforms'].add(mention['platform'])
-            influencer_data[username]['sentiment_scores'].append(mention['compound_score'])
+        usernames = filtered_mentions['username']
+        user_codes = usernames.codes
+        user_count = len(usernames.categories)
+        mention_counts = np.bincount(user_codes, minlength=user_count)
+        total_engagement = np.bincount(user_codes, weights=filtered_mentions['engagement'], minlength=user_count)
+        sentiment_totals = np.bincount(user_codes, weights=filtered_mentions['compound_score'], minlength=user_count)
+        
+        # Follower count from each user's latest mention, most recently active users first
+        latest_rows = filtered_mentions.latest_rows('username')
+        user_order = user_codes[latest_rows]
+        
+        # Distinct platforms per user
+        platform_names = filtered_mentions['platform'].categories
+        user_platforms = np.zeros((user_count, len(platform_names)), dtype=bool)
+        user_platforms[user_codes, filtered_mentions['platform'].codes] = True
         
         # Calculate average sentiment and create influencer list
         influencers = []
-        for username, data in influencer_data.items():
-            avg_sentiment = np.mean(data['sentiment_scores'])
+        for code, latest_row in zip(user_order, latest_rows):
             influencers.append({
-                'username': username,
-                'mentions': data['mentions'],
-                'total_engagement': data['total_engagement'],
-                'avg_engagement': data['total_engagement'] / data['mentions'],
-                'followers': data['followers'],
-                'platforms': ', '.join(data['platforms']),
-                'avg_sentiment': avg_sentiment
+                'username': usernames.categories[code],
+                'mentions': int(mention_counts[code]),
+                'total_engagement': int(total_engagement[code]),
+                'avg_engagement': total_engagement[code] / mention_counts[code],
+                'followers': int(filtered_mentions['followers_count'][latest_row]),
+                'platforms': ', '.join(platform_names[user_platforms[code]]),
+                'avg_sentiment': sentiment_totals[code] / mention_counts[code]
             })
         
         # Sort by total engagement
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+LeapScholar Sentiment Backfill
+Rescores stored mentions (from the mention store or a JSON Lines export)
+through a process pool of SentimentAnalyzer workers.
+
+Mentions are read lazily in chunks and each finished chunk is written to its
+own part file, so a killed run picks up where it stopped when restarted with
+the same arguments. The checkpoint records the sort key of the last mention
+of the finished chunks, so a resumed run continues after it even if the live
+store gained or dropped rows meanwhile. With --apply the rescored sentiment is
+written back to the store and its rollups.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ALL_COMPLETED, FIRST_COMPLETED, wait
+from itertools import islice
+from pathlib import Path
+
+from config import Config
+from sentiment_analyzer import SentimentAnalyzer, ENGINE_MODES
+from sentiment_cache import SentimentCache
+from mention_store import MentionStore
+
+# Per-worker analyzer, created once by the pool initializer so each process
+# loads the VADER lexicon a single time
+_worker_analyzer = None
+
+def init_worker(engine):
+    """Pool initializer: build this worker's SentimentAnalyzer"""
+    global _worker_analyzer
+    _worker_analyzer = SentimentAnalyzer(cache=SentimentCache(Config.SENTIMENT_CACHE_SIZE), engine=engine)
+
+def score_chunk(chunk_id, mentions):
+    """Rescore one chunk of mentions inside a worker process"""
+    start = time.perf_counter()
+    results = _worker_analyzer.analyze_batch([mention.get('text') for mention in mentions])
+
+    for i, mention in enumerate(mentions):
+        mention['sentiment'] = results['sentiment'][i]
+        mention['compound_score'] = float(results['compound'][i])
+        mention['confidence'] = float(results['confidence'][i])
+
+    return chunk_id, os.getpid(), mentions, time.perf_counter() - start
+
+def read_mentions(input_path, after=None):
+    """Stream (key, mention) pairs from the SQLite mention store or a JSON
+    Lines file, resuming after `key`.
+
+    Store keys are (timestamp, source, id); JSON Lines keys are line
+    numbers, since an export doesn't change under a running backfill.
+    """
+    if input_path.endswith('.db'):
+        yield from MentionStore(input_path).iter_keyed_mentions(after=after)
+        return
+    
+    with open(input_path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if line and (after is None or line_number > after):
+                yield line_number, json.loads(line)
+
+def iter_chunks(keyed_mentions, chunk_size, first_chunk_id=0):
+    """Group a (key, mention) stream into numbered (chunk_id, last key, mentions) chunks"""
+    keyed_mentions = iter(keyed_mentions)
+    chunk_id = first_chunk_id
+    while True:
+        chunk = list(islice(keyed_mentions, chunk_size))
+        if not chunk:
+            return
+        yield chunk_id, chunk[-1][0], [mention for _, mention in chunk]
+        chunk_id += 1
+
+def part_path(output_dir, chunk_id):
+    return output_dir / f"part-{chunk_id:06d}.jsonl"
+
+def write_part(output_dir, chunk_id, mentions):
+    """Write a finished chunk atomically so partial parts never count as done"""
+    final_path = part_path(output_dir, chunk_id)
+    tmp_path = final_path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for mention in mentions:
+            f.write(json.dumps(dict(mention.items()), default=str) + "\n")
+    os.replace(tmp_path, final_path)
+
+def load_checkpoint(output_dir, settings):
+    """Return (chunks done, key to resume after), refusing to resume a run with different settings.
+
+    Only the unbroken run of finished chunks counts. Parts finished past a gap
+    are deleted, because the rows they held are read again on resume.
+    """
+    checkpoint_file = output_dir / 'checkpoint.json'
+    chunks_done, resume_after = 0, None
+    if checkpoint_file.exists():
+        with open(checkpoint_file, encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        if checkpoint.get('settings') != settings:
+            raise ValueError(
+                f"{checkpoint_file} was written with different settings; "
+                "use a new --output directory or remove the old one"
+            )
+        chunks_done, resume_after = checkpoint['chunks_done'], checkpoint['resume_after']
+
+    for path in output_dir.glob('part-*.jsonl'):
+        if int(path.stem.split('-')[1]) >= chunks_done:
+            path.unlink()
+    return chunks_done, resume_after
+
+def save_checkpoint(output_dir, settings, chunks_done, resume_after):
+    checkpoint_file = output_dir / 'checkpoint.json'
+    tmp_file = checkpoint_file.with_suffix('.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({'settings': settings, 'chunks_done': chunks_done, 'resume_after': resume_after}, f)
+    os.replace(tmp_file, checkpoint_file)
+
+def run_backfill(input_path, output_dir, workers=None, chunk_size=500, engine=None):
+    """Rescore every mention in input_path and return per-worker throughput stats"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    engine = engine or Config.SENTIMENT_ENGINE
+
+    settings = {'input': str(Path(input_path).resolve()), 'chunk_size': chunk_size, 'engine': engine, 'resume': 'keyset'}
+    chunks_done, resume_after = load_checkpoint(output_dir, settings)
+    if chunks_done:
+        print(f"⏩ Resuming: {chunks_done} chunks already done")
+
+    worker_stats = defaultdict(lambda: {'mentions': 0, 'seconds': 0.0, 'chunks': 0})
+    last_keys = {}  # chunk_id -> key of its last mention
+    finished = {}  # Chunks written past the unbroken run, chunk_id -> last key
+    pending = set()
+    max_in_flight = workers * 2  # Keep memory bounded while streaming
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(engine,)) as pool:
+        def drain(block_until):
+            nonlocal chunks_done, resume_after
+            done, still_pending = wait(pending, return_when=block_until)
+            for future in done:
+                chunk_id, pid, mentions, elapsed = future.result()
+                write_part(output_dir, chunk_id, mentions)
+                finished[chunk_id] = last_keys.pop(chunk_id)
+                stats = worker_stats[pid]
+                stats['mentions'] += len(mentions)
+                stats['seconds'] += elapsed
+                stats['chunks'] += 1
+            while chunks_done in finished:
+                resume_after = finished.pop(chunks_done)
+                chunks_done += 1
+            save_checkpoint(output_dir, settings, chunks_done, resume_after)
+            return still_pending
+
+        for chunk_id, last_key, chunk in iter_chunks(read_mentions(input_path, resume_after), chunk_size, chunks_done):
+            last_keys[chunk_id] = last_key
+            pending.add(pool.submit(score_chunk, chunk_id, chunk))
+            if len(pending) >= max_in_flight:
+                pending = drain(FIRST_COMPLETED)
+
+        if pending:
+            drain(ALL_COMPLETED)
+
+    return dict(worker_stats)
+
+def apply_backfill(store_path, output_dir, batch_size=1000):
+    """Write the rescored sentiment in output_dir's parts back to the mention
+    store, moving rollup counts between sentiments. Returns mentions updated."""
+    store = MentionStore(store_path)
+    updated = 0
+    for path in sorted(Path(output_dir).glob('part-*.jsonl')):
+        with open(path, encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        for i in range(0, len(rows), batch_size):
+            updated += store.update_sentiment([
+                (row['source'], row['id'], row['sentiment'], row['compound_score'])
+                for row in rows[i:i + batch_size]
+            ])
+    store.close()
+    return updated
+
+def print_report(worker_stats, wall_seconds):
+    total = sum(stats['mentions'] for stats in worker_stats.values())
+    print("-" * 50)
+    for pid, stats in sorted(worker_stats.items()):
+        rate = stats['mentions'] / stats['seconds'] if stats['seconds'] > 0 else 0
+        print(f"👷 worker {pid}: {stats['mentions']} mentions in {stats['chunks']} chunks, {rate:.0f} mentions/sec")
+    overall = total / wall_seconds if wall_seconds > 0 else 0
+    print(f"✅ Rescored {total} mentions in {wall_seconds:.1f}s ({overall:.0f} mentions/sec overall)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Rescore stored mentions in parallel")
+    parser.add_argument('--input', default=Config.MENTION_STORE_PATH,
+                        help="Mention store (.db) or JSON Lines file (defaults to the mention store)")
+    parser.add_argument('--output', required=True, help="Directory for rescored parts and the checkpoint")
+    parser.add_argument('--workers', type=int, help="Worker processes (defaults to CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=500, help="Mentions per chunk")
+    parser.add_argument('--engine', choices=ENGINE_MODES, help="Sentiment engine mode")
+    parser.add_argument('--apply', action='store_true',
+                        help="Write the rescored sentiment back to the mention store (.db input only)")
+    args = parser.parse_args()
+    if args.apply and not args.input.endswith('.db'):
+        parser.error("--apply needs a mention store (.db) as --input")
+
+    print("🔁 LeapScholar Sentiment Backfill")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    try:
+        worker_stats = run_backfill(args.input, args.output, args.workers, args.chunk_size, args.engine)
+        applied = apply_backfill(args.input, args.output) if args.apply else None
+    except (OSError, ValueError) as e:
+        print(f"❌ Backfill failed: {e}")
+        return False
+    except KeyboardInterrupt:
+        print("\n⏸️  Backfill interrupted; rerun the same command to resume")
+        return False
+
+    print_report(worker_stats, time.perf_counter() - start)
+    if applied is not None:
+        print(f"💾 Applied rescored sentiment to {applied} stored mentions and their rollups")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    if not success:
+        sys.exit(1)
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Mention Volume Anomaly Backtest
+Scores every stored hour of the hourly rollups against its hour-of-week
+baseline and lists the hours the dashboard would have alerted on, to tune
+ANOMALY_Z_THRESHOLD and ANOMALY_MIN_COUNT.
+"""
+
+import argparse
+import time
+
+from anomaly_detector import VolumeAnomalyDetector
+from config import Config
+from mention_store import MentionStore
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest volume anomaly detection over stored history")
+    parser.add_argument('--store', default=Config.MENTION_STORE_PATH, help="Mention store (.db)")
+    parser.add_argument('--platform', action='append', help="Only these platforms (repeatable)")
+    parser.add_argument('--z-threshold', type=float, help="Robust z-score that counts as anomalous")
+    parser.add_argument('--min-count', type=int, help="Minimum mentions in an anomalous hour")
+    args = parser.parse_args()
+
+    print("📈 Mention Volume Anomaly Backtest")
+    print("=" * 50)
+
+    store = MentionStore(args.store)
+    rollups = store.query_rollups(resolution='hour')
+    detector = VolumeAnomalyDetector(z_threshold=args.z_threshold, min_count=args.min_count)
+
+    start = time.perf_counter()
+    anomalies = detector.backtest(rollups, platforms=args.platform)
+    elapsed = time.perf_counter() - start
+
+    print(f"🧮 Scored {len(rollups)} hourly buckets in {elapsed:.3f}s")
+    if anomalies.empty:
+        print("✅ No anomalous hours found")
+        return
+    print(f"🚨 {len(anomalies)} anomalous (hour, series) pairs:")
+    print(anomalies.to_string(index=False, float_format=lambda value: f"{value:.1f}"))
+
+if __name__ == "__main__":
+    main()
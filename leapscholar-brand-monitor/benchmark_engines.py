@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Sentiment Engine Benchmark
+Compares throughput and agreement of the vader_only, both and tiered engine modes
+so each deployment can pick its accuracy/latency trade-off via SENTIMENT_ENGINE.
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from data_collector import DataCollector
+from sentiment_analyzer import SentimentAnalyzer, ENGINE_MODES
+
+def load_texts(input_path=None, text_column='text'):
+    """Load texts from a CSV file, or fall back to the mock mention templates"""
+    if input_path:
+        return pd.read_csv(input_path)[text_column].dropna().astype(str).tolist()
+    # No collector instance, so benchmarking never opens the mention store
+    return [mention['text'] for mention in DataCollector.generate_mock_data()]
+
+def score_all(engine, texts, tiered_margin=None):
+    """Score texts uncached with one engine mode and return (results, seconds)"""
+    analyzer = SentimentAnalyzer(engine=engine, tiered_margin=tiered_margin)
+    analyzer.cache = None  # Measure raw scoring cost, not cache lookups
+
+    start = time.perf_counter()
+    results = [analyzer.analyze_sentiment(text) for text in texts]
+    return results, time.perf_counter() - start
+
+def compare_engines(texts, tiered_margin=None, reference_engine='both'):
+    """Return one row of throughput/agreement numbers per engine mode"""
+    reference, _ = score_all(reference_engine, texts, tiered_margin)
+
+    rows = []
+    for engine in ENGINE_MODES:
+        results, elapsed = score_all(engine, texts, tiered_margin)
+        agree = sum(1 for a, b in zip(results, reference) if a['sentiment'] == b['sentiment'])
+        compound_error = sum(abs(a['compound'] - b['compound']) for a, b in zip(results, reference))
+        textblob_calls = sum(1 for r in results if 'textblob_polarity' in r)
+
+        rows.append({
+            'engine': engine,
+            'texts_per_sec': len(texts) / elapsed if elapsed > 0 else float('inf'),
+            'label_agreement': agree / len(texts) if texts else 0,
+            'mean_compound_error': compound_error / len(texts) if texts else 0,
+            'textblob_rate': textblob_calls / len(texts) if texts else 0
+        })
+
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sentiment engine modes")
+    parser.add_argument('--input', help="CSV file with mention texts (defaults to mock data)")
+    parser.add_argument('--column', default='text', help="Text column in the CSV file")
+    parser.add_argument('--repeat', type=int, default=20, help="Times to repeat the text set")
+    parser.add_argument('--margin', type=float, help="Tiered margin around SENTIMENT_THRESHOLD")
+    args = parser.parse_args()
+
+    texts = load_texts(args.input, args.column) * args.repeat
+    print(f"📊 Scoring {len(texts)} texts per engine (agreement measured against 'both')")
+    print("-" * 72)
+    print(f"{'engine':<12}{'texts/sec':>12}{'label agree':>14}{'mean |Δ|':>12}{'TextBlob rate':>16}")
+    for row in compare_engines(texts, args.margin):
+        print(f"{row['engine']:<12}{row['texts_per_sec']:>12.0f}{row['label_agreement']:>13.1%}"
+              f"{row['mean_compound_error']:>12.3f}{row['textblob_rate']:>15.1%}")
+
+if __name__ == "__main__":
+    main()
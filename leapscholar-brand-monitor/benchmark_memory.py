@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Mention Memory Benchmark
+Compares the memory held by mentions read from the store as plain dicts,
+compact MentionRecord objects and a columnar MentionFrame, to size
+low-memory deployments (COMPACT_MENTION_RECORDS).
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+from data_collector import DataCollector
+from mention_store import MentionStore
+
+def build_store(path, count):
+    """Fill a store at `path` with `count` mock mentions with unique ids and urls"""
+    store = MentionStore(path)
+    collector = DataCollector(store=store)
+    batch = 0
+    while store.count() < count:
+        mentions = collector.generate_mock_data(days_back=30)
+        for i, mention in enumerate(mentions):
+            mention['id'] = f"{batch}_{i}"
+            mention['source'] = mention['platform'].lower().replace(' ', '_')
+            mention['url'] = f"{mention['url']}/{batch}"
+        store.append(mentions[:count - store.count()])
+        batch += 1
+    store.close()
+
+def measure(load):
+    """Return (bytes still allocated by the loaded mentions, seconds, mentions)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    mentions = load()
+    elapsed = time.perf_counter() - start
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated, elapsed, mentions
+
+def compare_representations(path):
+    """One row of memory/latency numbers per representation"""
+    loaders = [
+        ('dict', MentionStore(path, compact=False).query),
+        ('MentionRecord', MentionStore(path, compact=True).query),
+        ('MentionFrame', MentionStore(path).query_frame)
+    ]
+
+    rows = []
+    for name, load in loaders:
+        allocated, elapsed, mentions = measure(load)
+        rows.append({
+            'representation': name,
+            'bytes_per_mention': allocated / len(mentions) if len(mentions) else 0,
+            'total_mb': allocated / 1024 / 1024,
+            'load_seconds': elapsed
+        })
+        del mentions
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory used per mention")
+    parser.add_argument('--count', type=int, default=100000, help="Number of mentions to load")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'mentions.db')
+        print(f"🧮 Building a store with {args.count} mock mentions...")
+        build_store(path, args.count)
+        print("-" * 64)
+        print(f"{'representation':<16}{'bytes/mention':>16}{'total MB':>12}{'load sec':>12}")
+        for row in compare_representations(path):
+            print(f"{row['representation']:<16}{row['bytes_per_mention']:>16.0f}"
+                  f"{row['total_mb']:>12.1f}{row['load_seconds']:>12.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import hashlib
+import math
+import os
+import struct
+import threading
+from pathlib import Path
+
+from config import Config
+
+# File layout: magic, bit count, hash count, items added, error rate,
+# expected items, then the bit array
+HEADER = struct.Struct('<8sQIQdQ')
+MAGIC = b'LSBLOOM1'
+
+
+class BloomFilter:
+    """Compact set-membership filter with a bounded false-positive rate.
+
+    Sized from the expected number of items and the target error rate.
+    Membership answers are "definitely not seen" or "probably seen".
+    """
+
+    def __init__(self, expected_items, error_rate):
+        self.expected_items = expected_items
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-expected_items * math.log(error_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / expected_items * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        # Double hashing: k positions from two independent 64-bit hashes
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    @property
+    def saturated(self):
+        """True once more items were added than the filter was sized for"""
+        return self.count > self.expected_items
+
+    def save(self, path):
+        """Write the filter atomically so a crash never leaves a torn file"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, self.num_bits, self.num_hashes, self.count,
+                                self.error_rate, self.expected_items))
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read a filter written by save(); raises ValueError on a foreign file"""
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) != HEADER.size or not header.startswith(MAGIC):
+                raise ValueError(f"{path} is not a bloom filter file")
+            _, num_bits, num_hashes, count, error_rate, expected_items = HEADER.unpack(header)
+            bits = bytearray(f.read())
+
+        bloom = cls.__new__(cls)
+        bloom.expected_items = expected_items
+        bloom.error_rate = error_rate
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.bits = bits
+        bloom.count = count
+        return bloom
+
+
+def mention_key(mention):
+    """Key identifying a mention across collections: platform and id"""
+    return f"{mention.get('platform')}\x00{mention.get('id')}"
+
+
+class SeenIdFilter:
+    """Persisted Bloom filter of ingested (platform, id) pairs.
+
+    Lets the collector skip already-ingested mentions before any store
+    lookup, dedup or scoring work. A false positive (at most `error_rate`)
+    means a new mention is skipped; there are no false negatives. The filter
+    is rebuilt from the mention store when its file is missing, unreadable,
+    sized for a different error rate or fewer items, or saturated.
+    """
+
+    def __init__(self, store, path=None, expected_items=None, error_rate=None):
+        self.store = store
+        self.path = path
+        self.expected_items = expected_items or Config.SEEN_FILTER_EXPECTED_ITEMS
+        self.error_rate = error_rate or Config.SEEN_FILTER_ERROR_RATE
+        self.bloom = None
+        self._lock = threading.RLock()  # Pipeline stages mark IDs from different threads
+
+        if path and Path(path).exists():
+            try:
+                bloom = BloomFilter.load(path)
+            except (OSError, ValueError, struct.error):
+                bloom = None
+            if bloom is not None and self._matches_settings(bloom):
+                self.bloom = bloom
+        if self.bloom is None:
+            self.rebuild()
+
+    def _matches_settings(self, bloom):
+        if bloom.error_rate != self.error_rate or bloom.saturated:
+            return False
+        if bloom.expected_items < self.expected_items:
+            return False
+        # Keep a filter that was grown past the configured size
+        self.expected_items = bloom.expected_items
+        return True
+
+    def rebuild(self):
+        """Recreate the filter from every mention in the store"""
+        self.bloom = BloomFilter(self.expected_items, self.error_rate)
+        for mention in self.store.iter_mentions():
+            self.bloom.add(mention_key(mention))
+        self.save()
+        return self.bloom.count
+
+    def filter_unseen(self, mentions):
+        """Return only the mentions the filter has definitely not seen"""
+        return [mention for mention in mentions if mention_key(mention) not in self.bloom]
+
+    def mark_seen(self, mentions):
+        with self._lock:
+            for mention in mentions:
+                key = mention_key(mention)
+                if key not in self.bloom:
+                    self.bloom.add(key)
+            if self.bloom.saturated:
+                # Resize for the volume actually seen and rebuild from the store
+                self.expected_items *= 2
+                self.rebuild()
+
+    def save(self):
+        if self.path:
+            with self._lock:
+                self.bloom.save(self.path)
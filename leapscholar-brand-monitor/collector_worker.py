@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+LeapScholar Collector Worker
+Long-running process that polls each source on its own adaptive cadence,
+scores new mentions and appends them to the shared mention store. The
+dashboard only reads the store, so page loads never wait on scraping.
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from config import Config
+from data_collector import DataCollector
+from engagement_refresher import EngagementRefresher
+from poll_scheduler import PollScheduler
+
+def write_status(status, path=None):
+    """Atomically publish the worker's latest status for the dashboard"""
+    path = Path(path or Config.WORKER_STATUS_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(status, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+def read_status(path=None):
+    """Return the last status the worker published, or None if it never ran"""
+    path = Path(path or Config.WORKER_STATUS_PATH)
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def run_cycle(collector, source_names=None):
+    """Collect once and return a status record"""
+    started = datetime.now()
+    status = {'pid': os.getpid(), 'last_run_started': started.isoformat()}
+    try:
+        status['stored'] = collector.collect_new_mentions(source_names)
+        status['retention'] = collector.store.apply_retention()
+        status['ok'] = True
+    except Exception as e:
+        status['stored'] = 0
+        status['ok'] = False
+        status['error'] = str(e)
+    status['last_run_finished'] = datetime.now().isoformat()
+    status['polled'] = source_names
+    status['dedup'] = collector.last_dedup_report
+    status['pipeline'] = collector.last_pipeline_stats
+    return status
+
+def spiking_sources(collector):
+    """Sources whose sliding-window sentiment counters currently show a spike"""
+    if collector.spike_detector is None:
+        return set()
+    return {
+        name for name, _, _ in collector.sources
+        if collector.spike_detector.alert(sources=[name])
+    }
+
+def run_worker(interval_seconds=None, once=False, stop_event=None):
+    """Poll each source on its own adaptive cadence until stopped.
+    
+    A fixed `interval_seconds` pins every source to that cadence (rate limits
+    still apply).
+    """
+    stop_event = stop_event or threading.Event()
+    collector = DataCollector()
+    scheduler = PollScheduler(
+        [name for name, _, _ in collector.sources],
+        rate_limiters=collector.http_client.rate_limiters,
+        min_interval=interval_seconds,
+        max_interval=interval_seconds
+    )
+    refresher = EngagementRefresher(collector.store, collector.fetch_engagement)
+    source_status = {}
+
+    while not stop_event.is_set():
+        due = scheduler.due()
+        if due:
+            status = run_cycle(collector, due)
+            source_status.update(collector.last_collection_status)
+            spikes = spiking_sources(collector)
+            for name in due:
+                fetched = collector.last_collection_status.get(name, {}).get('count', 0)
+                scheduler.record_poll(name, fetched, spike=name in spikes)
+
+            status['sources'] = source_status
+            status['schedule'] = scheduler.snapshot()
+            status['next_run'] = datetime.fromtimestamp(scheduler.next_due_at()).isoformat()
+            write_status(status)
+
+            if status['ok']:
+                print(f"✅ {status['last_run_finished']}: polled {', '.join(due)}, stored {status['stored']} new mentions")
+            else:
+                print(f"❌ {status['last_run_finished']}: collection failed: {status['error']}")
+
+            # Keep engagement counts of recent mentions up to date
+            refresher.track(collector.store.query(start=datetime.now() - timedelta(seconds=refresher.max_age)))
+
+        refresh_due_at = refresher.next_due_at()
+        if refresh_due_at is not None and refresh_due_at <= time.time():
+            report = refresher.run_due()
+            print(f"📈 Refreshed engagement for {report['refreshed']} mentions in {report['calls']} calls")
+
+        if once:
+            break
+        next_due_at = min(at for at in (scheduler.next_due_at(), refresher.next_due_at()) if at is not None)
+        stop_event.wait(max(next_due_at - time.time(), 0))
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the background mention collector")
+    parser.add_argument('--interval', type=float, help="Poll every source at this fixed interval (seconds) instead of adaptively")
+    parser.add_argument('--once', action='store_true', help="Collect a single time and exit")
+    args = parser.parse_args()
+
+    stop_event = threading.Event()
+
+    def stop(signum, frame):
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    print(f"🛰️  Collector worker started (pid {os.getpid()})")
+    run_worker(args.interval, args.once, stop_event)
+    print("👋 Collector worker stopped")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    if not success:
+        sys.exit(1)
@@ -33,14 +33,99 @@ class Config:
     # Dashboard settings
     DEFAULT_TIME_RANGE = "Last 7 Days"
     DEFAULT_PLATFORMS = ["Twitter", "Reddit", "LinkedIn", "Google News"]
+    TREND_CHART_MIN_POINTS = 20  # Trend charts use the coarsest rollup tier giving at least this many points
     
     # Sentiment analysis settings
     SENTIMENT_THRESHOLD = 0.05
+    SENTIMENT_ENGINE = os.getenv('SENTIMENT_ENGINE', 'both')  # 'vader_only', 'both' or 'tiered'
+    SENTIMENT_TIERED_MARGIN = float(os.getenv('SENTIMENT_TIERED_MARGIN', 0.25))  # Tiered runs TextBlob when VADER is this close to the threshold
     SPIKE_DETECTION_THRESHOLD = 0.6  # 60% of mentions must be positive/negative to trigger alert
+    SPIKE_MIN_VOLUME = int(os.getenv('SPIKE_MIN_VOLUME', 10))  # Windows with fewer mentions never alert
+    SPIKE_WINDOWS_HOURS = [1, 6, 24]  # Sliding windows tracked by the streaming spike detector
+    SPIKE_WINDOW_SLOTS = 60  # Ring-buffer slots per window; window edges are exact to one slot
+    
+    # Volume anomalies against hour-of-week baselines of the hourly rollups
+    ANOMALY_Z_THRESHOLD = float(os.getenv('ANOMALY_Z_THRESHOLD', 4.0))  # Robust z-score that counts as anomalous
+    ANOMALY_SEASONAL_SMOOTHING = 0.3  # EWMA weight of the latest week in each hour-of-week baseline
+    ANOMALY_MIN_HISTORY_WEEKS = 2  # Weeks of history an hour of the week needs before it is scored
+    ANOMALY_MIN_COUNT = 10  # Hours with fewer mentions never count as anomalous
+    
+    # Sentiment result cache
+    SENTIMENT_CACHE_ENABLED = os.getenv('SENTIMENT_CACHE_ENABLED', 'true').lower() == 'true'
+    SENTIMENT_CACHE_SIZE = int(os.getenv('SENTIMENT_CACHE_SIZE', 10000))  # In-memory LRU entries
+    SENTIMENT_CACHE_PATH = os.getenv('SENTIMENT_CACHE_PATH')  # SQLite file; unset keeps the cache in memory only
     
     # Data collection settings
+    DATA_DIR = os.getenv('DATA_DIR', 'data')
+    MENTION_STORE_PATH = os.getenv('MENTION_STORE_PATH', os.path.join(DATA_DIR, 'mentions.db'))  # SQLite mention store
+    COMPACT_MENTION_RECORDS = os.getenv('COMPACT_MENTION_RECORDS', 'false').lower() == 'true'  # Slotted records instead of dicts
+    CURSOR_STORE_PATH = os.getenv('CURSOR_STORE_PATH', os.path.join(DATA_DIR, 'cursors.json'))  # Per-source high-water marks
+    RAW_MENTION_RETENTION_DAYS = int(os.getenv('RAW_MENTION_RETENTION_DAYS', 120))  # Older mentions survive only in rollups
+    ROLLUP_RETENTION_DAYS = {  # Per rollup tier; weekly buckets are kept forever
+        'hour': int(os.getenv('HOURLY_ROLLUP_RETENTION_DAYS', 120)),
+        'day': int(os.getenv('DAILY_ROLLUP_RETENTION_DAYS', 400)),
+        'week': None
+    }
+    EXTERNAL_COLLECTOR = os.getenv('EXTERNAL_COLLECTOR', 'false').lower() == 'true'  # Dashboard only reads; collector_worker.py writes
+    WORKER_STATUS_PATH = os.path.join(DATA_DIR, 'worker_status.json')
     MAX_MENTIONS_PER_PLATFORM = 100
+    PIPELINE_BATCH_SIZE = 200  # Mentions per batch flowing through the ingestion pipeline
+    PIPELINE_BUFFER_BATCHES = 4  # Batches each stage may queue before its producer blocks
+    
+    # Seen-ID Bloom filter checked before any other ingestion work
+    SEEN_FILTER_PATH = os.getenv('SEEN_FILTER_PATH', os.path.join(DATA_DIR, 'seen_ids.bloom'))
+    SEEN_FILTER_EXPECTED_ITEMS = int(os.getenv('SEEN_FILTER_EXPECTED_ITEMS', 1_000_000))
+    SEEN_FILTER_ERROR_RATE = float(os.getenv('SEEN_FILTER_ERROR_RATE', 0.001))
+    
+    # Duplicate detection at ingestion
+    DEDUP_ENABLED = os.getenv('DEDUP_ENABLED', 'true').lower() == 'true'
+    DEDUP_WINDOW_HOURS = 72  # Rolling window of kept mentions compared against
+    DEDUP_NEAR_DUPLICATE_THRESHOLD = 0.6  # Estimated Jaccard similarity of word shingles
+    DEDUP_MINHASH_PERMUTATIONS = 64
+    DEDUP_MINHASH_BANDS = 16  # LSH bands; 16 bands x 4 rows catches pairs above ~0.5 similarity
     CACHE_DURATION_MINUTES = 5
+    SOURCE_TIMEOUT_SECONDS = {  # Per-source deadline for one collection cycle
+        'twitter': float(os.getenv('TWITTER_TIMEOUT_SECONDS', 10)),
+        'reddit': float(os.getenv('REDDIT_TIMEOUT_SECONDS', 10)),
+        'google_news': float(os.getenv('GOOGLE_NEWS_TIMEOUT_SECONDS', 15))
+    }
+    
+    # HTTP client settings for the platform scrapers
+    HTTP_TIMEOUT_SECONDS = 10
+    HTTP_MAX_RETRIES = 4
+    HTTP_BACKOFF_BASE_SECONDS = 0.5
+    HTTP_BACKOFF_MAX_SECONDS = 30
+    HTTP_RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv('HTTP_RATE_LIMIT_MAX_WAIT_SECONDS', 5))  # Skip the source instead of waiting longer
+    HTTP_POOL_HOSTS = 10  # Hosts with their own keep-alive pool
+    HTTP_POOL_SIZE_PER_HOST = 10  # Keep-alive connections per host
+    HTTP_CACHE_ENABLED = os.getenv('HTTP_CACHE_ENABLED', 'true').lower() == 'true'  # ETag / If-Modified-Since response cache
+    HTTP_CACHE_PATH = os.path.join(DATA_DIR, 'http_cache.db')
+    HTTP_CACHE_MAX_BYTES = int(os.getenv('HTTP_CACHE_MAX_BYTES', 50 * 1024 * 1024))
+    
+    # Per-platform API quotas (requests per window, plus allowed burst)
+    PLATFORM_RATE_LIMITS = {
+        'twitter': {'requests': 450, 'per_seconds': 15 * 60, 'burst': 10},  # Recent search, app auth
+        'reddit': {'requests': 100, 'per_seconds': 60, 'burst': 10},  # OAuth clients
+        'google_news': {'requests': int(os.getenv('SERPAPI_MONTHLY_QUOTA', 100)), 'per_seconds': 30 * 24 * 3600, 'burst': 5},
+        'linkedin': {'requests': 100, 'per_seconds': 24 * 3600, 'burst': 5}
+    }
+    REDDIT_ANONYMOUS_RATE_LIMIT = {'requests': 10, 'per_seconds': 60, 'burst': 2}  # Without REDDIT_CLIENT_ID
+    
+    # Adaptive polling (collector_worker.py)
+    POLL_MIN_INTERVAL_SECONDS = float(os.getenv('POLL_MIN_INTERVAL_SECONDS', 60))
+    POLL_MAX_INTERVAL_SECONDS = float(os.getenv('POLL_MAX_INTERVAL_SECONDS', 3600))
+    POLL_TARGET_MENTIONS_PER_POLL = 20  # Poll once about this many new mentions are waiting
+    POLL_RATE_SMOOTHING = 0.3  # Weight of the latest poll in the smoothed arrival rate
+    POLL_SURGE_FACTOR = 3.0  # Arrivals this many times the smoothed rate count as a spike
+    
+    # Engagement refresh (collector_worker.py)
+    ENGAGEMENT_REFRESH_SOURCES = ['twitter', 'reddit']  # Sources with engagement counts to re-poll
+    ENGAGEMENT_REFRESH_BATCH_SIZE = 100  # IDs per API call (the Twitter and Reddit lookup limit)
+    ENGAGEMENT_REFRESH_MIN_INTERVAL_SECONDS = 300
+    ENGAGEMENT_REFRESH_MAX_INTERVAL_SECONDS = 6 * 3600
+    ENGAGEMENT_REFRESH_MAX_AGE_HOURS = 72  # Older mentions are no longer refreshed
+    ENGAGEMENT_REFRESH_AGE_FRACTION = 0.25  # Refresh again once a mention has aged this much more
+    ENGAGEMENT_FAST_VELOCITY = 50  # Engagement per hour that halves a mention's refresh interval
     
     # Influencer settings
     MIN_FOLLOWER_COUNT = 10000  # Minimum followers to be considered an influencer
@@ -0,0 +1,69 @@
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+
+class CursorStore:
+    """Durable per-source collection cursors.
+
+    Each source keeps a high-water mark: the id and timestamp of the newest
+    mention it has returned. Scrapers pass it to their API (since_id,
+    before/after, or a timestamp filter) so only newer items are fetched.
+    Cursors are saved as JSON and survive restarts; with no path they only
+    live in memory.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self._cursors = {}
+        self._lock = threading.Lock()
+
+        if self.path is not None and self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                self._cursors = json.load(f)
+
+    def get(self, source):
+        """Return the cursor for a source ({} when it has never been polled)"""
+        with self._lock:
+            cursor = dict(self._cursors.get(source, {}))
+        if 'last_timestamp' in cursor:
+            cursor['last_timestamp'] = datetime.fromisoformat(cursor['last_timestamp'])
+        return cursor
+
+    def advance(self, source, mentions):
+        """Move a source's high-water mark past the newest of `mentions`"""
+        if not mentions:
+            return self.get(source)
+
+        newest = max(mentions, key=lambda mention: mention['timestamp'])
+        current = self.get(source)
+        if current and newest['timestamp'] <= current['last_timestamp']:
+            return current
+
+        with self._lock:
+            self._cursors[source] = {
+                'last_id': newest['id'],
+                'last_timestamp': newest['timestamp'].isoformat()
+            }
+            self._save()
+        return self.get(source)
+
+    def reset(self, source=None):
+        """Forget one source's cursor (or all of them) to force a full re-collection"""
+        with self._lock:
+            if source is None:
+                self._cursors.clear()
+            else:
+                self._cursors.pop(source, None)
+            self._save()
+
+    def _save(self):
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._cursors, f, indent=2)
+        os.replace(tmp_path, self.path)
@@ -5,13 +5,85 @@ import random
 import requests
 from bs4 import BeautifulSoup
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from config import Config
+from http_client import HttpClient, RateLimited
+from cursor_store import CursorStore
+from mention_store import MentionStore
+from mention_frame import MentionFrame
+from dedup import DedupEngine
+from bloom_filter import SeenIdFilter
+from pipeline import Pipeline
+from sentiment_analyzer import SentimentAnalyzer
+from spike_detector import SpikeDetector, spike_alert
 
 class DataCollector:
-    def __init__(self):
+    def __init__(self, sources=None, http_client=None, cursor_store=None, store=None, analyzer=None):
         self.brand_keywords = ['leapscholar', 'leap scholar', 'leap-scholar', 'leap_scholar']
         
-    def generate_mock_data(self, days_back=7):
-        """Generate realistic mock data for demonstration"""
+        # Pooled, rate-limited HTTP client shared by the real scrapers
+        self.http_client = http_client or HttpClient()
+        
+        # Each source is (name, callable taking the source's cursor, timeout in seconds)
+        self.sources = sources if sources is not None else self.default_sources()
+        self.last_collection_status = {}
+        self.last_pipeline_stats = {}
+        
+        # Scores mentions inside the collection pipeline
+        self.analyzer = analyzer or SentimentAnalyzer()
+        
+        # Persistent mention store that new mentions are appended to
+        self.store = store if store is not None else MentionStore(Config.MENTION_STORE_PATH)
+        
+        # Ingestion state (cursors, seen IDs, dedup window) is only built on the
+        # first collection, so read-only users of the store never touch it
+        self.cursors = cursor_store
+        self.seen_filter = None
+        self.dedup = None
+        self.last_dedup_report = {}
+        self.last_seen_skipped = 0
+        self.spike_detector = None
+    
+    def _setup_ingestion(self):
+        """Load cursors, the seen-ID filter and the dedup window before collecting"""
+        if self.seen_filter is not None:
+            return
+        
+        # Ingestion state is only persisted alongside a persistent store, so a
+        # throwaway store never inherits cursors or seen IDs it doesn't hold
+        persistent = self.store.path != ':memory:'
+        
+        # High-water marks so each poll only fetches mentions newer than the last one
+        if self.cursors is None:
+            self.cursors = CursorStore(Config.CURSOR_STORE_PATH if persistent else None)
+        
+        # Skip already-ingested (platform, id) pairs before any other work
+        self.seen_filter = SeenIdFilter(self.store, Config.SEEN_FILTER_PATH if persistent else None)
+        
+        # Drop exact and near-duplicate mentions before they are stored
+        if Config.DEDUP_ENABLED:
+            self.dedup = DedupEngine()
+            self.dedup.warm(self.store.query(start=datetime.now() - self.dedup.window))
+        
+        # Sliding-window sentiment counters, seeded with the longest window's mentions
+        self.spike_detector = SpikeDetector()
+        self.spike_detector.observe_frame(
+            self.store.query_frame(start=datetime.now() - timedelta(hours=max(self.spike_detector.windows)))
+        )
+    
+    def default_sources(self):
+        """Return the platform scrapers polled by get_all_mentions"""
+        timeouts = Config.SOURCE_TIMEOUT_SECONDS
+        return [
+            ('twitter', lambda cursor: self.scrape_twitter("LeapScholar", cursor=cursor), timeouts['twitter']),
+            ('reddit', lambda cursor: self.scrape_reddit(["studyabroad", "college", "universities"], cursor=cursor), timeouts['reddit']),
+            ('google_news', lambda cursor: self.scrape_google_news("LeapScholar", cursor=cursor), timeouts['google_news'])
+        ]
+        
+    @staticmethod
+    def generate_mock_data(days_back=7):
+        """Generate realistic mock data for demonstration (needs no collector instance)"""
         mentions = []
         
         # Sample positive mentions
@@ -113,72 +185,203 @@ class DataCollector:
         
         return mentions
     
-    def scrape_twitter(self, query, count=100):
-        """Scrape Twitter mentions (mock implementation)"""
-        # In a real implementation, you would use Twitter API or twint
+    def newer_than_cursor(self, mentions, cursor):
+        """Keep only mentions past a source's high-water mark"""
+        if not cursor:
+            return mentions
+        return [m for m in mentions if m['timestamp'] > cursor['last_timestamp']]
+    
+    def scrape_twitter(self, query, count=100, cursor=None):
+        """Scrape Twitter mentions newer than the cursor (mock implementation)"""
+        # In a real implementation, you would use Twitter API or twint,
+        # passing since_id=cursor['last_id']
         # For now, return mock data
-        return self.generate_mock_data()
+        return self.newer_than_cursor(self.generate_mock_data(), cursor)
     
-    def scrape_reddit(self, subreddits, count=100):
-        """Scrape Reddit mentions (mock implementation)"""
-        # In a real implementation, you would use PRAW
+    def scrape_reddit(self, subreddits, count=100, cursor=None):
+        """Scrape Reddit mentions newer than the cursor (mock implementation)"""
+        # In a real implementation, you would use PRAW,
+        # passing params={'before': cursor['last_id']} to the /new listing
         # For now, return mock data
-        return self.generate_mock_data()
+        return self.newer_than_cursor(self.generate_mock_data(), cursor)
     
-    def scrape_google_news(self, query, count=50):
-        """Scrape Google News mentions (mock implementation)"""
-        # In a real implementation, you would use SerpAPI or similar
+    def scrape_google_news(self, query, count=50, cursor=None):
+        """Scrape Google News mentions newer than the cursor (mock implementation)"""
+        # In a real implementation, you would use SerpAPI or similar,
+        # filtering on results published after cursor['last_timestamp']
         # For now, return mock data
-        return self.generate_mock_data()
+        return self.newer_than_cursor(self.generate_mock_data(), cursor)
+    
+    def fetch_engagement(self, source, mentions):
+        """Fetch current engagement counts for a batch of mentions in one call (mock implementation)"""
+        # In a real implementation, one request covers the whole batch:
+        # Twitter GET /2/tweets?ids=...&tweet.fields=public_metrics,
+        # Reddit GET /api/info?id=t3_...,t3_...
+        # For now, grow the last known counts a little
+        counts = {}
+        for mention in mentions:
+            counts[str(mention['id'])] = {
+                'likes': mention.get('likes', 0) + random.randint(0, 20),
+                'retweets': mention.get('retweets', 0) + random.randint(0, 5),
+                'comments': mention.get('comments', 0) + random.randint(0, 3)
+            }
+        return counts
+    
+    def _timed_fetch(self, fetch, cursor):
+        """Run one source and return (mentions, seconds taken)"""
+        start_time = time.monotonic()
+        mentions = fetch(cursor)
+        return mentions, time.monotonic() - start_time
     
-    def get_all_mentions(self):
-        """Get mentions from all platforms"""
-        all_mentions = []
+    def get_all_mentions(self, days_back=30):
+        """Get mentions from all platforms.
         
-        # Collect from different platforms
-        twitter_mentions = self.scrape_twitter("LeapScholar")
-        reddit_mentions = self.scrape_reddit(["studyabroad", "college", "universities"])
-        news_mentions = self.scrape_google_news("LeapScholar")
+        Sources are polled concurrently, each with its own deadline; sources
+        that time out, raise or are out of rate-limit budget are skipped, so
+        partial results still come back and per-source outcomes are kept in
+        last_collection_status. Each source only fetches mentions newer than
+        its cursor, which are appended to the store; the result is read back
+        from the store, newest first.
+        """
+        return self.get_all_mentions_with_status(days_back)[0]
+    
+    def get_all_mentions_with_status(self, days_back=30):
+        """Like get_all_mentions(), but returns (mentions, status) where status
+        is this collection's {source: outcome}; sources whose outcome has
+        status 'ok' answered. Stored mentions are not tagged, since most of
+        them were fetched in earlier collections."""
+        self.collect_new_mentions()
+        status = dict(self.last_collection_status)
+        return self.store.query(start=datetime.now() - timedelta(days=days_back)), status
+    
+    def collect_new_mentions(self, source_names=None):
+        """Poll every source (or only `source_names`) once and stream new mentions into the store.
         
-        all_mentions.extend(twitter_mentions)
-        all_mentions.extend(reddit_mentions)
-        all_mentions.extend(news_mentions)
+        Runs the collect -> clean -> dedup -> score -> store pipeline with
+        bounded buffers between stages and returns how many mentions were
+        stored. Per-stage throughput and buffer depth are kept in
+        last_pipeline_stats.
+        """
+        self._setup_ingestion()
+        self._newest_fetched = {}
+        self._cycle_dedup_report = Counter()
+        self._stored_count = 0
+        self.last_seen_skipped = 0
         
-        # Sort by timestamp
-        all_mentions.sort(key=lambda x: x['timestamp'], reverse=True)
+        pipeline = Pipeline(self.iter_source_batches(source_names=source_names), [
+            ('clean', self._clean_batch),
+            ('dedup', self._dedup_batch),
+            ('score', self._score_batch),
+            ('store', self._store_batch)
+        ])
+        self.last_pipeline_stats = pipeline.run()
+        self.last_dedup_report = dict(self._cycle_dedup_report)
         
-        return all_mentions
+        # Only move cursors once everything fetched this cycle has been handled
+        self.seen_filter.save()
+        for name, newest in self._newest_fetched.items():
+            self.cursors.advance(name, [newest])
+        
+        return self._stored_count
     
-    def detect_spikes(self, mentions_data, window_hours=24):
-        """Detect sentiment spikes in the last 24 hours"""
-        current_time = datetime.now()
-        recent_mentions = [
-            mention for mention in mentions_data 
-            if (current_time - mention['timestamp']).total_seconds() < window_hours * 3600
+    def iter_source_batches(self, batch_size=None, source_names=None):
+        """Poll sources concurrently and yield their mentions in batches as each answers"""
+        batch_size = batch_size or Config.PIPELINE_BATCH_SIZE
+        status = {}
+        sources = [
+            source for source in self.sources
+            if source_names is None or source[0] in source_names
         ]
         
-        if not recent_mentions:
-            return None
-        
-        # Calculate sentiment distribution
-        positive_count = sum(1 for m in recent_mentions if m['sentiment'] == 'positive')
-        negative_count = sum(1 for m in recent_mentions if m['sentiment'] == 'negative')
-        total_count = len(recent_mentions)
-        
-        # Detect spikes (if more than 60% of recent mentions are positive/negative)
-        if positive_count / total_count > 0.6:
-            return {
-                'type': 'positive_spike',
-                'percentage': (positive_count / total_count) * 100,
-                'count': positive_count,
-                'total': total_count
-            }
-        elif negative_count / total_count > 0.6:
-            return {
-                'type': 'negative_spike',
-                'percentage': (negative_count / total_count) * 100,
-                'count': negative_count,
-                'total': total_count
-            }
+        # Collect from different platforms in parallel
+        executor = ThreadPoolExecutor(max_workers=max(len(sources), 1))
+        start_time = time.monotonic()
+        pending = {
+            executor.submit(self._timed_fetch, fetch, self.cursors.get(name)): (name, start_time + timeout, timeout)
+            for name, fetch, timeout in sources
+        }
+        
+        try:
+            while pending:
+                next_deadline = min(deadline for _, deadline, _ in pending.values())
+                done, _ = wait(pending, timeout=max(next_deadline - time.monotonic(), 0),
+                               return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    name, _, _ = pending.pop(future)
+                    try:
+                        mentions, elapsed = future.result()
+                    except RateLimited as e:
+                        status[name] = {'status': 'skipped', 'count': 0, 'elapsed': time.monotonic() - start_time, 'error': str(e)}
+                        continue
+                    except Exception as e:
+                        status[name] = {'status': 'error', 'count': 0, 'elapsed': time.monotonic() - start_time, 'error': str(e)}
+                        continue
+                    status[name] = {'status': 'ok', 'count': len(mentions), 'elapsed': elapsed}
+                    
+                    for mention in mentions:
+                        mention['source'] = name
+                        newest = self._newest_fetched.get(name)
+                        if newest is None or mention['timestamp'] > newest['timestamp']:
+                            self._newest_fetched[name] = mention
+                    for i in range(0, len(mentions), batch_size):
+                        yield mentions[i:i + batch_size]
+                
+                # Give up on sources past their own deadline
+                now = time.monotonic()
+                for future, (name, deadline, timeout) in list(pending.items()):
+                    if deadline <= now:
+                        future.cancel()
+                        del pending[future]
+                        status[name] = {'status': 'timeout', 'count': 0, 'elapsed': timeout}
+        finally:
+            # Don't wait for slow sources; their threads finish in the background
+            executor.shutdown(wait=False)
+            self.last_collection_status = status
+    
+    def _clean_batch(self, mentions):
+        """Drop already-ingested mentions and normalise fields"""
+        unseen = self.seen_filter.filter_unseen(mentions)
+        self.last_seen_skipped += len(mentions) - len(unseen)
+        for mention in unseen:
+            mention['id'] = str(mention['id'])
+            mention['text'] = (mention.get('text') or '').strip()
+        return unseen
+    
+    def _dedup_batch(self, mentions):
+        if self.dedup is None:
+            return mentions
+        kept = self.dedup.filter(mentions)
+        self._cycle_dedup_report.update(self.dedup.last_report)
+        # Duplicates are final decisions; remember them so they are skipped next time
+        kept_ids = set(id(mention) for mention in kept)
+        self.seen_filter.mark_seen([m for m in mentions if id(m) not in kept_ids])
+        return kept
+    
+    def _score_batch(self, mentions):
+        """Score sentiment for a whole batch at once"""
+        results = self.analyzer.analyze_batch([mention['text'] for mention in mentions])
+        for i, mention in enumerate(mentions):
+            mention['sentiment'] = results['sentiment'][i]
+            mention['compound_score'] = float(results['compound'][i])
+        return mentions
+    
+    def _store_batch(self, mentions):
+        self.store.append(mentions)
+        self.seen_filter.mark_seen(mentions)
+        self.spike_detector.observe(mentions)
+        self._stored_count += len(mentions)
+        return mentions
+    
+    def detect_spikes(self, mentions_data, window_hours=24):
+        """Detect sentiment spikes in the last 24 hours of an arbitrary batch of
+        mentions; live ingestion is tracked by `spike_detector` instead"""
+        mentions = MentionFrame.coerce(mentions_data)
+        recent_mentions = mentions.filter(start=datetime.now() - timedelta(hours=window_hours))
         
-        return None 
\ No newline at end of file
+        # Spike if more than SPIKE_DETECTION_THRESHOLD of enough recent mentions are positive/negative
+        return spike_alert(
+            recent_mentions.count('sentiment', 'positive'),
+            recent_mentions.count('sentiment', 'negative'),
+            len(recent_mentions)
+        )
@@ -0,0 +1,180 @@
+import hashlib
+import re
+from collections import Counter, deque
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from config import Config
+
+URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+')
+HANDLE_PATTERN = re.compile(r'@\w+|#\w+')
+RETWEET_PREFIX = re.compile(r'^(rt|via)\b')
+WORD_PATTERN = re.compile(r'\w+')
+
+# MinHash permutations are ((a * x + b) mod p) truncated to 32 bits over
+# 32-bit shingle hashes; a * x is allowed to wrap at 64 bits
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def normalize_text(text):
+    """Lowercase text and strip URLs, handles, RT prefixes and punctuation"""
+    if not text or not isinstance(text, str):
+        return ""
+    text = text.lower()
+    text = URL_PATTERN.sub(' ', text)
+    text = HANDLE_PATTERN.sub(' ', text)
+    text = ' '.join(WORD_PATTERN.findall(text))
+    return RETWEET_PREFIX.sub('', text).strip()
+
+
+def text_hash(normalized_text):
+    return hashlib.sha1(normalized_text.encode('utf-8')).hexdigest()
+
+
+def shingles(normalized_text):
+    """Word unigrams and bigrams of normalized text"""
+    words = normalized_text.split()
+    return set(words) | {' '.join(pair) for pair in zip(words, words[1:])}
+
+
+class MinHasher:
+    """MinHash signatures whose agreement rate estimates Jaccard similarity"""
+
+    def __init__(self, num_perm=64, seed=1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.a = rng.randint(1, int(MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, int(MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+
+    def signature(self, features):
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(f.encode('utf-8'), digest_size=4).digest(), 'big') for f in features),
+            dtype=np.uint64, count=len(features)
+        )
+        return (((np.outer(hashes, self.a) + self.b) % MERSENNE_PRIME) & MAX_HASH).min(axis=0)
+
+    @staticmethod
+    def similarity(sig_a, sig_b):
+        return float(np.mean(sig_a == sig_b))
+
+
+class DedupEngine:
+    """Ingestion-stage duplicate filter over a rolling window of kept mentions.
+
+    A mention is dropped when its (platform, id) or normalized-text hash was
+    already kept, or when its MinHash-estimated Jaccard similarity to a kept
+    mention reaches `threshold`. Near-duplicate candidates come from LSH band
+    buckets, so each lookup only compares against mentions sharing a band
+    rather than the whole window.
+    """
+
+    def __init__(self, window_hours=None, threshold=None, num_perm=None, bands=None):
+        self.window = timedelta(hours=Config.DEDUP_WINDOW_HOURS if window_hours is None else window_hours)
+        self.threshold = Config.DEDUP_NEAR_DUPLICATE_THRESHOLD if threshold is None else threshold
+        num_perm = num_perm or Config.DEDUP_MINHASH_PERMUTATIONS
+        self.bands = bands or Config.DEDUP_MINHASH_BANDS
+        if num_perm % self.bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.rows = num_perm // self.bands
+        self.hasher = MinHasher(num_perm)
+
+        self._ids = set()
+        self._texts = {}
+        self._signatures = {}
+        self._buckets = [dict() for _ in range(self.bands)]
+        self._history = deque()  # (seen_at, key, text digest) in arrival order
+
+        self.cluster_sizes = Counter()  # kept key -> duplicates folded into it
+        self.totals = Counter()
+        self.last_report = {}
+
+    def _band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def _find_near_duplicate(self, signature):
+        checked = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            for key in self._buckets[band].get(band_key, ()):
+                if key in checked:
+                    continue
+                checked.add(key)
+                if MinHasher.similarity(signature, self._signatures[key]) >= self.threshold:
+                    return key
+        return None
+
+    def _remember(self, key, digest, signature, seen_at):
+        self._ids.add(key)
+        if signature is not None:
+            self._texts[digest] = key
+            self._signatures[key] = signature
+            for band, band_key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(band_key, set()).add(key)
+        self._history.append((seen_at, key, digest))
+
+    def _expire(self, now):
+        """Forget kept mentions that fell out of the rolling window"""
+        cutoff = now - self.window
+        while self._history and self._history[0][0] < cutoff:
+            _, key, digest = self._history.popleft()
+            self._ids.discard(key)
+            if self._texts.get(digest) == key:
+                del self._texts[digest]
+            signature = self._signatures.pop(key, None)
+            if signature is not None:
+                for band, band_key in enumerate(self._band_keys(signature)):
+                    bucket = self._buckets[band].get(band_key)
+                    if bucket is not None:
+                        bucket.discard(key)
+                        if not bucket:
+                            del self._buckets[band][band_key]
+            self.cluster_sizes.pop(key, None)
+
+    def warm(self, mentions):
+        """Seed the window with already-stored mentions (e.g. after a restart)"""
+        for mention in sorted(mentions, key=lambda m: m['timestamp']):
+            normalized = normalize_text(mention.get('text'))
+            key = (mention.get('platform'), str(mention.get('id')))
+            signature = self.hasher.signature(shingles(normalized)) if normalized else None
+            self._remember(key, text_hash(normalized), signature, mention['timestamp'])
+
+    def filter(self, mentions, now=None):
+        """Return the mentions that are not duplicates, recording why others were dropped"""
+        now = now or datetime.now()
+        self._expire(now)
+
+        report = Counter()
+        kept = []
+        for mention in mentions:
+            key = (mention.get('platform'), str(mention.get('id')))
+            if key in self._ids:
+                report['exact_id'] += 1
+                self.cluster_sizes[key] += 1
+                continue
+
+            normalized = normalize_text(mention.get('text'))
+            digest = text_hash(normalized)
+            signature = None
+            if normalized:
+                original = self._texts.get(digest)
+                if original is not None:
+                    report['exact_text'] += 1
+                    self.cluster_sizes[original] += 1
+                    continue
+
+                signature = self.hasher.signature(shingles(normalized))
+                original = self._find_near_duplicate(signature)
+                if original is not None:
+                    report['near_duplicate'] += 1
+                    self.cluster_sizes[original] += 1
+                    continue
+
+            self._remember(key, digest, signature, now)
+            report['kept'] += 1
+            kept.append(mention)
+
+        report['dropped'] = report['exact_id'] + report['exact_text'] + report['near_duplicate']
+        self.totals.update(report)
+        self.last_report = dict(report)
+        return kept
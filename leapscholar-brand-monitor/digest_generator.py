@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
+from mention_frame import MentionFrame
 
 load_dotenv()
 
@@ -31,33 +32,26 @@ class DigestGenerator:
         
     def generate_daily_digest(self, mentions_data, brand_name="LeapScholar"):
         """Generate a 100-word daily digest of top conversations"""
-        if not mentions_data:
+        mentions = MentionFrame.coerce(mentions_data)
+        if not len(mentions):
             return "No mentions found for today."
         
         # Get today's mentions
-        today = datetime.now().date()
-        today_mentions = [
-            mention for mention in mentions_data 
-            if mention['timestamp'].date() == today
-        ]
+        midnight = datetime.combine(datetime.now().date(), datetime.min.time())
+        today_mentions = mentions.filter(start=midnight, end=midnight + timedelta(days=1))
         
-        if not today_mentions:
+        if not len(today_mentions):
             return "No mentions found for today."
         
-        # Categorize mentions
-        positive_mentions = [m for m in today_mentions if m['sentiment'] == 'positive']
-        negative_mentions = [m for m in today_mentions if m['sentiment'] == 'negative']
-        neutral_mentions = [m for m in today_mentions if m['sentiment'] == 'neutral']
-        
         # Get top mentions by engagement
-        top_mentions = sorted(today_mentions, key=lambda x: x['engagement'], reverse=True)[:5]
+        top_mentions = today_mentions.to_records(today_mentions.top('engagement', 5))
         
         # Prepare data for AI
         summary_data = {
             'total_mentions': len(today_mentions),
-            'positive_count': len(positive_mentions),
-            'negative_count': len(negative_mentions),
-            'neutral_count': len(neutral_mentions),
+            'positive_count': today_mentions.count('sentiment', 'positive'),
+            'negative_count': today_mentions.count('sentiment', 'negative'),
+            'neutral_count': today_mentions.count('sentiment', 'neutral'),
             'top_mentions': [
                 {
                     'text': mention['text'][:100] + "..." if len(mention['text']) > 100 else mention['text'],
@@ -132,15 +126,14 @@ class DigestGenerator:
     
     def generate_tweet_suggestions(self, mentions_data, sentiment_type="negative"):
         """Generate tweet suggestions for responding to sentiment spikes"""
-        if not mentions_data:
+        mentions = MentionFrame.coerce(mentions_data)
+        if not len(mentions):
             return []
         
-        # Get recent mentions of the specified sentiment
-        recent_mentions = [
-            mention for mention in mentions_data 
-            if mention['sentiment'] == sentiment_type and 
-            (datetime.now() - mention['timestamp']).days <= 1
-        ]
+        # Get recent mentions of the specified sentiment (less than two days old)
+        recent_mentions = mentions.filter(
+            start=datetime.now() - timedelta(days=2), sentiments=[sentiment_type]
+        ).to_records()
         
         if not recent_mentions:
             return []
@@ -0,0 +1,153 @@
+import heapq
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from config import Config
+from mention_record import MentionRecord
+
+
+def engagement_score(likes, retweets, comments):
+    """Weighted engagement used across the dashboard"""
+    return likes + retweets * 2 + comments * 3
+
+
+def engagement_velocity(history):
+    """Engagement gained per hour between the last two observations, given
+    oldest first as dicts with `observed_at` and `engagement`"""
+    if len(history) < 2:
+        return 0.0
+    previous, latest = history[-2], history[-1]
+    hours = (latest['observed_at'] - previous['observed_at']).total_seconds() / 3600
+    if hours <= 0:
+        return 0.0
+    return (latest['engagement'] - previous['engagement']) / hours
+
+
+def observation(observed_at, engagement):
+    """Engagement observation in the shape of MentionStore.engagement_history()"""
+    return {'observed_at': datetime.fromtimestamp(observed_at), 'engagement': engagement}
+
+
+class EngagementRefresher:
+    """Priority queue of mentions whose engagement counts should be re-polled.
+
+    A mention's next refresh is due after a fraction of its age, so young
+    posts are refreshed every few minutes and older ones ever more rarely;
+    fast-growing posts (high engagement velocity) are pulled forward. Posts
+    older than `max_age_hours` are retired and never refreshed again. Due
+    mentions are fetched in batches per source, one `fetch` call per batch:
+    fetch(source, mentions) returns {id: {'likes', 'retweets', 'comments'}}.
+    """
+
+    def __init__(self, store, fetch, sources=None, batch_size=None, min_interval=None,
+                 max_interval=None, max_age_hours=None, age_fraction=None,
+                 fast_velocity=None, clock=time.time):
+        self.store = store
+        self.fetch = fetch
+        self.sources = set(sources or Config.ENGAGEMENT_REFRESH_SOURCES)
+        self.batch_size = batch_size or Config.ENGAGEMENT_REFRESH_BATCH_SIZE
+        self.min_interval = min_interval or Config.ENGAGEMENT_REFRESH_MIN_INTERVAL_SECONDS
+        self.max_interval = max_interval or Config.ENGAGEMENT_REFRESH_MAX_INTERVAL_SECONDS
+        self.max_age = (max_age_hours or Config.ENGAGEMENT_REFRESH_MAX_AGE_HOURS) * 3600
+        self.age_fraction = age_fraction or Config.ENGAGEMENT_REFRESH_AGE_FRACTION
+        self.fast_velocity = fast_velocity or Config.ENGAGEMENT_FAST_VELOCITY
+        self.clock = clock
+        self._lock = threading.Lock()
+
+        self._queue = []  # (due_at, source, id)
+        self._tracked = {}  # (source, id) -> compact record of the mention as last refreshed
+        self._last_observed = {}  # (source, id) -> {'observed_at', 'engagement'} as last fetched
+        self.velocities = {}  # (source, id) -> engagement per hour
+        self.last_report = {}
+
+    def __len__(self):
+        return len(self._tracked)
+
+    def track(self, mentions):
+        """Queue mentions for refreshing; already-tracked and too-old ones are ignored"""
+        now = self.clock()
+        added = 0
+        with self._lock:
+            for mention in mentions:
+                key = (mention.get('source'), str(mention.get('id')))
+                if key[0] not in self.sources or key in self._tracked:
+                    continue
+                if now - mention['timestamp'].timestamp() > self.max_age:
+                    continue
+                self._tracked[key] = MentionRecord.from_mention(mention)
+                self._last_observed[key] = observation(now, mention.get('engagement', 0))
+                heapq.heappush(self._queue, (now + self._interval(key, now), *key))
+                added += 1
+        return added
+
+    def next_due_at(self):
+        with self._lock:
+            return self._queue[0][0] if self._queue else None
+
+    def _interval(self, key, now):
+        """Seconds until the mention's next refresh, or None once it is too old"""
+        age = now - self._tracked[key]['timestamp'].timestamp()
+        if age > self.max_age:
+            return None
+        interval = max(self.min_interval, age * self.age_fraction)
+        interval /= 1 + max(self.velocities.get(key, 0.0), 0.0) / self.fast_velocity
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def _pop_due(self, now):
+        due = defaultdict(list)
+        with self._lock:
+            while self._queue and self._queue[0][0] <= now:
+                _, source, mention_id = heapq.heappop(self._queue)
+                due[source].append(self._tracked[(source, mention_id)])
+        return due
+
+    def run_due(self):
+        """Refresh every mention that is due, batching IDs per source"""
+        now = self.clock()
+        report = {'refreshed': 0, 'calls': 0, 'retired': 0, 'failed': 0}
+
+        for source, mentions in self._pop_due(now).items():
+            for i in range(0, len(mentions), self.batch_size):
+                batch = mentions[i:i + self.batch_size]
+                report['calls'] += 1
+                try:
+                    counts = self.fetch(source, batch)
+                except Exception:
+                    counts = {}
+                    report['failed'] += len(batch)
+
+                for values in counts.values():
+                    values['engagement'] = engagement_score(
+                        values.get('likes', 0), values.get('retweets', 0), values.get('comments', 0)
+                    )
+                self.store.update_engagement(source, counts, observed_at=now)
+                report['refreshed'] += len(counts)
+                report['retired'] += self._reschedule(source, batch, counts, now)
+
+        self.last_report = report
+        return report
+
+    def _reschedule(self, source, batch, counts, now):
+        """Update velocities and requeue the batch; returns how many were retired"""
+        retired = 0
+        with self._lock:
+            for mention in batch:
+                key = (source, str(mention['id']))
+                values = counts.get(key[1])
+                if values is not None:
+                    latest = observation(now, values['engagement'])
+                    self.velocities[key] = engagement_velocity([self._last_observed[key], latest])
+                    self._last_observed[key] = latest
+                    mention.update(values)
+
+                interval = self._interval(key, now)
+                if interval is None:
+                    del self._tracked[key]
+                    self._last_observed.pop(key, None)
+                    self.velocities.pop(key, None)
+                    retired += 1
+                else:
+                    heapq.heappush(self._queue, (now + interval, *key))
+        return retired
@@ -0,0 +1,147 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+class HttpResponseCache:
+    """On-disk cache of validated GET responses for conditional requests.
+
+    Only responses carrying an ETag or Last-Modified validator are kept. On
+    the next request for the same URL the validators are sent back as
+    If-None-Match / If-Modified-Since, and a 304 answer is served from the
+    stored body. Total body size is capped at `max_bytes`, evicting the least
+    recently used entries first. Hits, misses and bytes saved are counted per
+    source. Pass ':memory:' (or no path) for a throwaway cache.
+    """
+
+    def __init__(self, path=None, max_bytes=50 * 1024 * 1024):
+        self.path = path or ':memory:'
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = None
+        self._counters = defaultdict(lambda: {'hits': 0, 'misses': 0, 'bytes_saved': 0})
+        self.evictions = 0
+
+    def _connect(self):
+        # Opened on first use so clients that never fetch don't create the file
+        if self._db is None:
+            if self.path != ':memory:':
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    status INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used);
+            """)
+            self._db.commit()
+        return self._db
+
+    def conditional_headers(self, url):
+        """Validator headers to send for `url`, or {} if nothing is cached"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT etag, last_modified FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return {}
+        headers = {}
+        if row[0]:
+            headers['If-None-Match'] = row[0]
+        if row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+
+    def not_modified(self, source, url, response):
+        """Turn a 304 into the cached full response, or None if the entry is gone"""
+        with self._lock:
+            db = self._connect()
+            row = db.execute(
+                "SELECT status, headers, body FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE responses SET last_used = ? WHERE url = ?", (time.time(), url))
+            db.commit()
+            self._counters[source]['hits'] += 1
+            self._counters[source]['bytes_saved'] += len(row[2])
+
+        cached = requests.Response()
+        cached.status_code = row[0]
+        cached.headers = CaseInsensitiveDict(json.loads(row[1]))
+        # Fresh validators from the 304 supersede the stored ones
+        for name in ('ETag', 'Last-Modified', 'Date', 'Cache-Control', 'Expires'):
+            if name in response.headers:
+                cached.headers[name] = response.headers[name]
+        cached._content = row[2]
+        cached.encoding = get_encoding_from_headers(cached.headers)
+        cached.url = response.url
+        cached.request = response.request
+        cached.elapsed = response.elapsed
+        cached.not_modified = True
+        return cached
+
+    def store(self, source, url, response):
+        """Remember a fresh 200 response if it carries a validator"""
+        with self._lock:
+            self._counters[source]['misses'] += 1
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        body = response.content
+        if response.status_code != 200 or not (etag or last_modified) or len(body) > self.max_bytes:
+            return False
+
+        with self._lock:
+            db = self._connect()
+            db.execute(
+                "INSERT OR REPLACE INTO responses (url, etag, last_modified, status, headers, body, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, response.status_code, json.dumps(dict(response.headers)),
+                 body, len(body), time.time())
+            )
+            self._evict(db)
+            db.commit()
+        return True
+
+    def _evict(self, db):
+        """Drop least recently used entries until the total size fits max_bytes"""
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for url, size in db.execute("SELECT url, size FROM responses ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            victims.append((url,))
+            total -= size
+        db.executemany("DELETE FROM responses WHERE url = ?", victims)
+        self.evictions += len(victims)
+
+    def stats(self):
+        """Per-source hits, misses, hit ratio and bytes saved"""
+        with self._lock:
+            report = {}
+            for source, counters in self._counters.items():
+                lookups = counters['hits'] + counters['misses']
+                report[source] = dict(counters, hit_ratio=counters['hits'] / lookups if lookups else 0.0)
+            return report
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
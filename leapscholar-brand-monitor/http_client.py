@@ -0,0 +1,205 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import Config
+from http_cache import HttpResponseCache
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class RateLimited(Exception):
+    """A request would have to wait longer than allowed for rate-limit tokens"""
+
+    def __init__(self, platform, wait_seconds):
+        super().__init__(f"{platform} rate limit exhausted; next request allowed in {wait_seconds:.0f}s")
+        self.platform = platform
+        self.wait_seconds = wait_seconds
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`"""
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        """Take tokens if available right now; return False instead of waiting"""
+        with self._lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1, max_wait=None, name=None):
+        """Block until tokens are available, then take them. Returns seconds waited.
+
+        Raises RateLimited instead of sleeping when the tokens would not be
+        available within `max_wait` seconds.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            if max_wait is not None and waited + delay > max_wait:
+                raise RateLimited(name, delay)
+            self._sleep(delay)
+            waited += delay
+
+    def remaining(self):
+        """Tokens currently available"""
+        with self._lock:
+            self._refill()
+            return self.tokens
+
+
+def build_rate_limiters(config=Config, clock=time.monotonic, sleep=time.sleep):
+    """Create one token bucket per platform from the quotas in Config"""
+    limiters = {}
+    for platform, quota in config.PLATFORM_RATE_LIMITS.items():
+        # Reddit allows a higher rate for OAuth clients than for anonymous ones
+        if platform == 'reddit' and not config.REDDIT_CLIENT_ID:
+            quota = config.REDDIT_ANONYMOUS_RATE_LIMIT
+        if quota['requests'] <= 0 or quota['per_seconds'] <= 0 or quota.get('burst', 1) <= 0:
+            raise ValueError(f"Rate limit for {platform} must be positive, got {quota}")
+        rate = quota['requests'] / quota['per_seconds']
+        limiters[platform] = TokenBucket(rate, quota.get('burst', 1), clock=clock, sleep=sleep)
+    return limiters
+
+
+class HttpClient:
+    """Shared HTTP client for the platform scrapers.
+
+    Keeps one keep-alive connection pool per host, applies each platform's
+    token-bucket rate limit before sending (raising RateLimited rather than
+    waiting more than `max_rate_limit_wait` seconds), and retries 429/5xx responses and
+    connection errors with exponential backoff (honouring Retry-After).
+    GET requests go through a conditional-request cache: a 304 is answered
+    from the cached body, and such responses have `not_modified` set so
+    callers can skip re-parsing an unchanged payload.
+    """
+
+    def __init__(self, rate_limiters=None, max_retries=None, backoff_base=None,
+                 backoff_max=None, timeout=None, sleep=time.sleep, cache=None, max_rate_limit_wait=None):
+        self.rate_limiters = rate_limiters if rate_limiters is not None else build_rate_limiters()
+        self.max_retries = Config.HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = Config.HTTP_BACKOFF_BASE_SECONDS if backoff_base is None else backoff_base
+        self.backoff_max = Config.HTTP_BACKOFF_MAX_SECONDS if backoff_max is None else backoff_max
+        self.timeout = Config.HTTP_TIMEOUT_SECONDS if timeout is None else timeout
+        self.max_rate_limit_wait = Config.HTTP_RATE_LIMIT_MAX_WAIT_SECONDS if max_rate_limit_wait is None else max_rate_limit_wait
+        self._sleep = sleep
+        if cache is None and Config.HTTP_CACHE_ENABLED:
+            cache = HttpResponseCache(Config.HTTP_CACHE_PATH, Config.HTTP_CACHE_MAX_BYTES)
+        self.cache = cache
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = Config.REDDIT_USER_AGENT
+        adapter = HTTPAdapter(pool_connections=Config.HTTP_POOL_HOSTS, pool_maxsize=Config.HTTP_POOL_SIZE_PER_HOST)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.stats = {'requests': 0, 'retries': 0, 'rate_limited_seconds': 0.0}
+        self._stats_lock = threading.Lock()
+
+    def request(self, platform, method, url, **kwargs):
+        """Send a rate-limited request for `platform`, retrying transient failures"""
+        kwargs.setdefault('timeout', self.timeout)
+        limiter = self.rate_limiters.get(platform)
+
+        cache_url = None
+        if self.cache is not None and method.upper() == 'GET':
+            cache_url = requests.Request(method, url, params=kwargs.get('params')).prepare().url
+            kwargs['headers'] = {**self.cache.conditional_headers(cache_url), **(kwargs.get('headers') or {})}
+
+        attempt = 0
+        while True:
+            if limiter is not None:
+                waited = limiter.acquire(max_wait=self.max_rate_limit_wait, name=platform)
+                self._count('rate_limited_seconds', waited)
+
+            self._count('requests')
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                response = None
+
+            if response is not None and response.status_code not in RETRY_STATUS_CODES:
+                if cache_url is not None:
+                    return self._through_cache(platform, cache_url, response)
+                return response
+            if attempt >= self.max_retries:
+                return response
+
+            self._count('retries')
+            self._sleep(self._backoff_delay(attempt, response))
+            attempt += 1
+
+    def get(self, platform, url, **kwargs):
+        return self.request(platform, 'GET', url, **kwargs)
+
+    def post(self, platform, url, **kwargs):
+        return self.request(platform, 'POST', url, **kwargs)
+
+    def _through_cache(self, platform, cache_url, response):
+        """Serve 304s from the cache and remember validated 200s"""
+        if response.status_code == 304:
+            cached = self.cache.not_modified(platform, cache_url, response)
+            if cached is not None:
+                return cached
+            return response
+        self.cache.store(platform, cache_url, response)
+        response.not_modified = False
+        return response
+
+    def _backoff_delay(self, attempt, response):
+        """Exponential backoff with jitter, deferring to Retry-After when given"""
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max)
+        delay = self.backoff_base * (2 ** attempt)
+        return min(delay, self.backoff_max) * random.uniform(0.5, 1.0)
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def close(self):
+        self.session.close()
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
@@ -0,0 +1,224 @@
+import math
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from dateutil.tz import tzlocal
+from pandas.api.types import union_categoricals
+
+# Column layout: epoch-second timestamps, categorical labels, NumPy metrics
+TIMESTAMP_COLUMN = 'timestamp'
+CATEGORY_COLUMNS = ['source', 'platform', 'sentiment', 'username']
+INT_COLUMNS = ['likes', 'retweets', 'comments', 'engagement', 'followers_count']
+FLOAT_COLUMNS = ['compound_score']
+OBJECT_COLUMNS = ['id', 'text', 'url']
+ALL_COLUMNS = [TIMESTAMP_COLUMN] + CATEGORY_COLUMNS + INT_COLUMNS + FLOAT_COLUMNS + OBJECT_COLUMNS
+
+
+def _epoch(value):
+    return value.timestamp() if isinstance(value, datetime) else value
+
+
+def cutoff_seconds(value):
+    """Epoch-second bound for a datetime/epoch: rows at or after it are >= this value"""
+    return math.ceil(_epoch(value))
+
+
+class MentionFrame:
+    """Columnar batch of mentions shared by the collector, analyzer and dashboard.
+
+    Timestamps are int64 epoch seconds, platform/sentiment/username/source
+    are pandas Categoricals, and engagement metrics and scores are NumPy
+    arrays, so filters and aggregations run vectorized. Iterating yields
+    plain mention dicts for code that still works per mention.
+    """
+
+    def __init__(self, columns, table=None):
+        self.columns = columns
+        self.table = table  # Backing Arrow table for frozen frames
+        self._length = len(columns[TIMESTAMP_COLUMN])
+
+    @classmethod
+    def from_columns(cls, data):
+        """Build a frame from {column: sequence}; missing columns get defaults"""
+        length = len(data.get(TIMESTAMP_COLUMN, ()))
+        columns = {}
+        timestamps = np.asarray([_epoch(value) for value in data.get(TIMESTAMP_COLUMN, ())], dtype=np.float64)
+        columns[TIMESTAMP_COLUMN] = np.floor(timestamps).astype(np.int64)
+        for name in CATEGORY_COLUMNS:
+            values = data.get(name)
+            values = [value if value is not None else '' for value in values] if values is not None else [''] * length
+            columns[name] = pd.Categorical(values)
+        for name in INT_COLUMNS:
+            values = data.get(name)
+            columns[name] = (
+                np.asarray([value or 0 for value in values], dtype=np.int64) if values is not None
+                else np.zeros(length, dtype=np.int64)
+            )
+        for name in FLOAT_COLUMNS:
+            values = data.get(name)
+            columns[name] = (
+                np.asarray([0.0 if value is None else value for value in values], dtype=np.float64)
+                if values is not None else np.zeros(length, dtype=np.float64)
+            )
+        for name in OBJECT_COLUMNS:
+            values = data.get(name)
+            columns[name] = np.asarray(
+                [str(value) if value is not None else '' for value in values] if values is not None else [''] * length,
+                dtype=object
+            )
+        return cls(columns)
+
+    @classmethod
+    def from_rows(cls, names, rows):
+        """Build a frame from row tuples whose fields are `names`"""
+        values = list(zip(*rows)) if rows else [()] * len(names)
+        return cls.from_columns(dict(zip(names, values)))
+
+    @classmethod
+    def from_mentions(cls, mentions):
+        return cls.from_columns({name: [mention.get(name) for mention in mentions] for name in ALL_COLUMNS})
+
+    @classmethod
+    def empty(cls):
+        return cls.from_columns({})
+
+    def to_arrow(self):
+        """Arrow table of the columns; categoricals become dictionary arrays"""
+        arrays = {}
+        for name, column in self.columns.items():
+            if name in CATEGORY_COLUMNS:
+                arrays[name] = pa.DictionaryArray.from_arrays(
+                    pa.array(column.codes), pa.array(column.categories.to_numpy(dtype=object), type=pa.string())
+                )
+            elif name in OBJECT_COLUMNS:
+                arrays[name] = pa.array(column, type=pa.string())
+            else:
+                arrays[name] = pa.array(column)
+        return pa.table(arrays)
+
+    @classmethod
+    def from_arrow(cls, table):
+        """Read-only frame over an Arrow table; numeric and code arrays are not copied"""
+        columns = {}
+        for name in table.column_names:
+            array = table.column(name).combine_chunks()
+            if name in CATEGORY_COLUMNS:
+                columns[name] = pd.Categorical.from_codes(
+                    array.indices.to_numpy(zero_copy_only=True), array.dictionary.to_pylist()
+                )
+            elif name in OBJECT_COLUMNS:
+                values = np.asarray(array.to_pylist(), dtype=object)
+                values.flags.writeable = False
+                columns[name] = values
+            else:
+                columns[name] = array.to_numpy(zero_copy_only=True)
+        return cls(columns, table=table)
+
+    def frozen(self):
+        """Immutable copy backed by Arrow buffers, safe to share between sessions"""
+        if self.table is not None:
+            return self
+        return MentionFrame.from_arrow(self.to_arrow())
+
+    @classmethod
+    def concat(cls, frames):
+        """Stack frames built from the same source (categories are unioned)"""
+        frames = list(frames)
+        if not frames:
+            return cls.empty()
+        if len(frames) == 1:
+            return frames[0]
+        columns = {}
+        for name in frames[0].columns:
+            parts = [frame.columns[name] for frame in frames]
+            if name in CATEGORY_COLUMNS:
+                columns[name] = union_categoricals(parts)
+            else:
+                columns[name] = np.concatenate(parts)
+        return cls(columns)
+
+    @classmethod
+    def coerce(cls, mentions):
+        """Return `mentions` as a MentionFrame, converting a list of dicts"""
+        if isinstance(mentions, cls):
+            return mentions
+        return cls.from_mentions(list(mentions or []))
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield self.record(i)
+
+    def take(self, selector):
+        """Rows selected by a boolean mask or an index array, as a new frame"""
+        return MentionFrame({name: column[selector] for name, column in self.columns.items()})
+
+    def mask(self, start=None, end=None, platforms=None, sentiments=None, sources=None):
+        """Boolean mask of rows in [start, end) with the given platforms/sentiments/sources"""
+        keep = np.ones(self._length, dtype=bool)
+        timestamps = self.columns[TIMESTAMP_COLUMN]
+        if start is not None:
+            keep &= timestamps >= cutoff_seconds(start)
+        if end is not None:
+            keep &= timestamps < cutoff_seconds(end)
+        if platforms is not None:
+            keep &= self.columns['platform'].isin(list(platforms))
+        if sentiments is not None:
+            keep &= self.columns['sentiment'].isin(list(sentiments))
+        if sources is not None:
+            keep &= self.columns['source'].isin(list(sources))
+        return keep
+
+    def filter(self, start=None, end=None, platforms=None, sentiments=None, sources=None):
+        return self.take(self.mask(start, end, platforms, sentiments, sources))
+
+    def count(self, column, value):
+        """Rows whose categorical `column` equals `value`"""
+        return int(np.count_nonzero(np.asarray(self.columns[column] == value)))
+
+    def value_counts(self, column):
+        """{category: rows} for a categorical column, skipping empty categories"""
+        categorical = self.columns[column]
+        counts = np.bincount(categorical.codes[categorical.codes >= 0], minlength=len(categorical.categories))
+        return {category: int(n) for category, n in zip(categorical.categories, counts) if n}
+
+    def top(self, column, n):
+        """Indices of the n largest values of `column`; ties go to the newest mention"""
+        return np.lexsort((-self.columns[TIMESTAMP_COLUMN], -self.columns[column]))[:n]
+
+    def latest_rows(self, column):
+        """Index of the newest row for each value of categorical `column`,
+        newest first, whatever the frame's row order"""
+        codes = self.columns[column].codes
+        timestamps = self.columns[TIMESTAMP_COLUMN]
+        by_value = np.lexsort((timestamps, codes))
+        last_of_value = np.append(codes[by_value][1:] != codes[by_value][:-1], True)
+        rows = by_value[last_of_value & (codes[by_value] >= 0)]
+        return rows[np.argsort(-timestamps[rows], kind='stable')]
+
+    def local_dates(self):
+        """Calendar date of each mention in local time"""
+        return pd.to_datetime(self.columns[TIMESTAMP_COLUMN], unit='s', utc=True).tz_convert(tzlocal()).date
+
+    def record(self, i):
+        """Row `i` as a mention dict"""
+        mention = {}
+        for name, column in self.columns.items():
+            value = column[i]
+            if name == TIMESTAMP_COLUMN:
+                value = datetime.fromtimestamp(int(value))
+            elif isinstance(value, np.generic):
+                value = value.item()
+            mention[name] = value
+        return mention
+
+    def to_records(self, indices=None):
+        indices = range(self._length) if indices is None else indices
+        return [self.record(i) for i in indices]
@@ -0,0 +1,69 @@
+import numpy as np
+
+from mention_frame import MentionFrame, cutoff_seconds
+
+
+class MentionIndex:
+    """Time index over a MentionFrame, partitioned by platform.
+
+    Each platform's mentions are kept as one contiguous block sorted by
+    epoch timestamp, so a time range is found with two binary searches and
+    returned as slices (views) of that block: O(log n + k) per query rather
+    than a scan of every mention. `start` records the earliest time the
+    indexed frame is known to cover. With `freeze`, the sorted rows live in
+    one read-only Arrow table (`table`) that every partition views.
+    """
+
+    def __init__(self, frame, start=None, freeze=False):
+        self.start = start
+        self.partitions = {}
+
+        platforms = frame['platform']
+        order = np.lexsort((frame['timestamp'], platforms.codes))
+        ordered = frame.take(order)
+        if freeze:
+            ordered = ordered.frozen()
+        self.table = ordered.table
+        codes = ordered['platform'].codes
+        bounds = np.searchsorted(codes, np.arange(len(platforms.categories) + 1))
+        for code, platform in enumerate(platforms.categories):
+            lo, hi = bounds[code], bounds[code + 1]
+            if hi > lo:
+                self.partitions[platform] = ordered.take(slice(lo, hi))
+
+    def __len__(self):
+        return sum(len(partition) for partition in self.partitions.values())
+
+    def covers(self, start):
+        """True if rows from `start` onwards are all in the index"""
+        return self.start is None or (start is not None and cutoff_seconds(start) >= cutoff_seconds(self.start))
+
+    def _slice(self, partition, start, end):
+        timestamps = partition['timestamp']
+        lo = 0 if start is None else np.searchsorted(timestamps, cutoff_seconds(start), 'left')
+        hi = len(timestamps) if end is None else np.searchsorted(timestamps, cutoff_seconds(end), 'left')
+        return lo, hi
+
+    def views(self, start=None, end=None, platforms=None):
+        """Per-platform frames for [start, end), sliced without copying"""
+        names = self.partitions if platforms is None else [p for p in platforms if p in self.partitions]
+        views = []
+        for name in names:
+            partition = self.partitions[name]
+            lo, hi = self._slice(partition, start, end)
+            if hi > lo:
+                views.append(partition.take(slice(lo, hi)))
+        return views
+
+    def select(self, start=None, end=None, platforms=None):
+        """Mentions in [start, end) on the given platforms, as one frame"""
+        return MentionFrame.concat(self.views(start, end, platforms))
+
+    def count(self, start=None, end=None, platforms=None):
+        """Number of matching mentions, from the binary searches alone"""
+        names = self.partitions if platforms is None else [p for p in platforms if p in self.partitions]
+        total = 0
+        for name in names:
+            lo, hi = self._slice(self.partitions[name], start, end)
+            total += max(hi - lo, 0)
+        return total
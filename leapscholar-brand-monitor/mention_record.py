@@ -0,0 +1,139 @@
+import struct
+import sys
+from datetime import datetime
+
+# Timestamp (epoch seconds), likes, retweets, comments, engagement, followers, compound score
+PACKED_FIELDS = ['timestamp', 'likes', 'retweets', 'comments', 'engagement', 'followers_count', 'compound_score']
+PACKED = struct.Struct('<qIIIIIf')
+
+# Low-cardinality labels shared by many mentions
+INTERNED_FIELDS = ['source', 'platform', 'sentiment', 'username']
+STRING_FIELDS = INTERNED_FIELDS + ['id', 'text', 'url']
+
+FIELDS = [
+    'source', 'id', 'platform', 'text', 'username', 'timestamp', 'likes', 'retweets',
+    'comments', 'engagement', 'followers_count', 'sentiment', 'compound_score', 'url'
+]
+
+
+def _clamp_count(value):
+    return min(max(int(value or 0), 0), 0xFFFFFFFF)
+
+
+class MentionRecord:
+    """Memory-compact, dict-compatible mention.
+
+    String labels are interned so every mention from the same platform or
+    user shares one string object; the timestamp, engagement counts and
+    compound score are packed into a single bytes value (epoch seconds,
+    uint32 counts, float32 score). Reads like a dict -- record['timestamp']
+    still returns a datetime -- so code written against mention dicts keeps
+    working. Keys outside FIELDS (such as a backfill's `confidence`) are
+    kept as given in an overflow dict that only exists once one is set.
+    """
+
+    __slots__ = ('source', 'id', 'platform', 'text', 'username', 'sentiment', 'url', '_packed', '_extra')
+
+    def __init__(self, **fields):
+        for name in STRING_FIELDS:
+            value = fields.get(name)
+            value = '' if value is None else str(value)
+            setattr(self, name, sys.intern(value) if name in INTERNED_FIELDS else value)
+        self._packed = self._pack(fields)
+        extra = {name: value for name, value in fields.items() if name not in FIELDS}
+        self._extra = extra or None
+
+    @classmethod
+    def from_mention(cls, mention):
+        if isinstance(mention, cls):
+            return mention
+        return cls(**{name: mention.get(name) for name in FIELDS})
+
+    @staticmethod
+    def _pack(fields):
+        timestamp = fields.get('timestamp')
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.timestamp()
+        return PACKED.pack(
+            int(timestamp or 0),
+            *(_clamp_count(fields.get(name)) for name in PACKED_FIELDS[1:-1]),
+            float(fields.get('compound_score') or 0.0)
+        )
+
+    def _unpacked(self):
+        return dict(zip(PACKED_FIELDS, PACKED.unpack(self._packed)))
+
+    def __getitem__(self, name):
+        if name in PACKED_FIELDS:
+            value = PACKED.unpack(self._packed)[PACKED_FIELDS.index(name)]
+            return datetime.fromtimestamp(value) if name == 'timestamp' else value
+        if name in STRING_FIELDS:
+            return getattr(self, name)
+        if self._extra is not None and name in self._extra:
+            return self._extra[name]
+        raise KeyError(name)
+
+    def __setitem__(self, name, value):
+        self.update({name: value})
+
+    def update(self, values):
+        packed = None
+        for name, value in dict(values).items():
+            if name in PACKED_FIELDS:
+                if packed is None:
+                    packed = self._unpacked()
+                packed[name] = value
+            elif name in STRING_FIELDS:
+                value = '' if value is None else str(value)
+                setattr(self, name, sys.intern(value) if name in INTERNED_FIELDS else value)
+            else:
+                if self._extra is None:
+                    self._extra = {}
+                self._extra[name] = value
+        if packed is not None:
+            self._packed = self._pack(packed)
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __contains__(self, name):
+        return name in FIELDS or (self._extra is not None and name in self._extra)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(FIELDS) + len(self._extra or ())
+
+    def keys(self):
+        return FIELDS + list(self._extra or ())
+
+    def values(self):
+        return [self[name] for name in self.keys()]
+
+    def items(self):
+        return [(name, self[name]) for name in self.keys()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, MentionRecord):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"MentionRecord({self.to_dict()!r})"
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        self._extra = None  # Absent from records pickled before overflow keys existed
+        for name, value in state.items():
+            setattr(self, name, sys.intern(value) if name in INTERNED_FIELDS else value)
@@ -0,0 +1,454 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from config import Config
+from mention_frame import MentionFrame
+from mention_record import MentionRecord
+from rollups import RESOLUTIONS, MentionRollups, bucket_start, ceil_bucket
+
+# Stored columns, in table order; timestamps are kept as epoch seconds
+COLUMNS = [
+    'source', 'id', 'platform', 'text', 'username', 'timestamp', 'likes', 'retweets',
+    'comments', 'engagement', 'followers_count', 'sentiment', 'compound_score', 'url'
+]
+ENGAGEMENT_COLUMNS = ['likes', 'retweets', 'comments', 'engagement']
+# Columns a mention contributes to its rollup buckets
+ROLLUP_SOURCE_COLUMNS = ['timestamp', 'platform', 'sentiment', 'compound_score', 'engagement', 'followers_count']
+
+
+class MentionStore:
+    """Append-only SQLite store of collected mentions.
+
+    Rows are keyed by (source, id); re-ingesting a known mention is a no-op.
+    Indexes on timestamp, platform and sentiment keep time-range reads
+    proportional to the rows returned. Pass ':memory:' (or no path) for a
+    throwaway store.
+
+    Engagement counts are the only mutable fields; every observation of them
+    (at ingestion and on each refresh) is also kept in engagement_history.
+    With `compact` (default COMPACT_MENTION_RECORDS) reads return
+    MentionRecord objects instead of dicts, for low-memory deployments.
+
+    mention_rollups keeps per (bucket, platform, sentiment) aggregates at
+    hourly, daily and weekly resolution, updated in the same transaction as
+    every insert and engagement refresh; a late-arriving mention simply lands
+    in its own, older buckets. apply_retention() drops raw mentions and fine
+    buckets past their retention, so long ranges are served from coarse ones.
+    """
+
+    def __init__(self, path=None, compact=None):
+        self.path = path or ':memory:'
+        self.compact = Config.COMPACT_MENTION_RECORDS if compact is None else compact
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        if self.path != ':memory:':
+            # WAL lets readers (the dashboard) work while a writer ingests
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock:
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS mentions (
+                    source TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    platform TEXT NOT NULL,
+                    text TEXT,
+                    username TEXT,
+                    timestamp REAL NOT NULL,
+                    likes INTEGER DEFAULT 0,
+                    retweets INTEGER DEFAULT 0,
+                    comments INTEGER DEFAULT 0,
+                    engagement INTEGER DEFAULT 0,
+                    followers_count INTEGER DEFAULT 0,
+                    sentiment TEXT,
+                    compound_score REAL,
+                    url TEXT,
+                    ingested_at REAL NOT NULL,
+                    PRIMARY KEY (source, id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_mentions_timestamp ON mentions (timestamp);
+                CREATE INDEX IF NOT EXISTS idx_mentions_platform_timestamp ON mentions (platform, timestamp);
+                CREATE INDEX IF NOT EXISTS idx_mentions_sentiment_timestamp ON mentions (sentiment, timestamp);
+                CREATE TABLE IF NOT EXISTS engagement_history (
+                    source TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    observed_at REAL NOT NULL,
+                    likes INTEGER DEFAULT 0,
+                    retweets INTEGER DEFAULT 0,
+                    comments INTEGER DEFAULT 0,
+                    engagement INTEGER DEFAULT 0,
+                    PRIMARY KEY (source, id, observed_at)
+                );
+            """)
+            columns = [row['name'] for row in self._db.execute("PRAGMA table_info(mention_rollups)")]
+            if columns and 'resolution' not in columns:
+                # Hourly-only rollups from before tiers; rebuilt below
+                self._db.execute("DROP TABLE mention_rollups")
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS mention_rollups (
+                    resolution TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    platform TEXT NOT NULL,
+                    sentiment TEXT NOT NULL,
+                    count INTEGER DEFAULT 0,
+                    compound_sum REAL DEFAULT 0,
+                    engagement_sum INTEGER DEFAULT 0,
+                    influencer_count INTEGER DEFAULT 0,
+                    PRIMARY KEY (resolution, bucket, platform, sentiment)
+                );
+                CREATE TABLE IF NOT EXISTS store_meta (
+                    key TEXT PRIMARY KEY,
+                    value REAL
+                );
+            """)
+            self._db.commit()
+            has_rollups = self._db.execute("SELECT 1 FROM mention_rollups LIMIT 1").fetchone()
+            has_mentions = self._db.execute("SELECT 1 FROM mentions LIMIT 1").fetchone()
+        if has_mentions and not has_rollups:
+            # Stores created before rollups existed
+            self.rebuild_rollups()
+
+    def append(self, mentions):
+        """Ingest mentions, skipping ones already stored. Returns rows inserted."""
+        ingested_at = time.time()
+        rows = [self._to_row(mention, ingested_at) for mention in mentions]
+        if not rows:
+            return 0
+
+        insert = (
+            f"INSERT OR IGNORE INTO mentions ({', '.join(COLUMNS)}, ingested_at) "
+            f"VALUES ({', '.join('?' for _ in range(len(COLUMNS) + 1))})"
+        )
+        history_positions = [COLUMNS.index(column) for column in ['source', 'id'] + ENGAGEMENT_COLUMNS]
+        rollup_positions = [COLUMNS.index(column) for column in ROLLUP_SOURCE_COLUMNS]
+        with self._lock:
+            inserted = [row for row in rows if self._db.execute(insert, row).rowcount]
+            # First engagement observation of the rows inserted by this call
+            self._db.executemany(
+                f"INSERT OR IGNORE INTO engagement_history (source, id, {', '.join(ENGAGEMENT_COLUMNS)}, observed_at) "
+                f"VALUES ({', '.join('?' for _ in range(len(history_positions) + 1))})",
+                [[row[i] for i in history_positions] + [ingested_at] for row in inserted]
+            )
+            self._apply_rollup_deltas(self._rollup_deltas([[row[i] for i in rollup_positions] for row in inserted]))
+            self._db.commit()
+            return len(inserted)
+
+    def update_engagement(self, source, counts, observed_at=None):
+        """Record fresh engagement counts, given as {id: {likes, retweets, comments, engagement}}"""
+        observed_at = observed_at or time.time()
+        updates = [
+            [values.get(column, 0) for column in ENGAGEMENT_COLUMNS] + [source, str(mention_id)]
+            for mention_id, values in counts.items()
+        ]
+        if not updates:
+            return 0
+
+        with self._lock:
+            # Engagement sums of the affected buckets move by (new - old)
+            deltas = {}
+            for update in updates:
+                row = self._db.execute(
+                    "SELECT timestamp, platform, sentiment, engagement FROM mentions WHERE source = ? AND id = ?",
+                    update[-2:]
+                ).fetchone()
+                if row is None:
+                    continue
+                delta = update[ENGAGEMENT_COLUMNS.index('engagement')] - row['engagement']
+                for resolution in RESOLUTIONS:
+                    key = (resolution, bucket_start(row['timestamp'], resolution), row['platform'], row['sentiment'] or '')
+                    deltas[key] = deltas.get(key, 0) + delta
+            self._db.executemany(
+                "UPDATE mention_rollups SET engagement_sum = engagement_sum + ? "
+                "WHERE resolution = ? AND bucket = ? AND platform = ? AND sentiment = ?",
+                [(delta, *key) for key, delta in deltas.items() if delta]
+            )
+            self._db.executemany(
+                f"UPDATE mentions SET {', '.join(f'{column} = ?' for column in ENGAGEMENT_COLUMNS)} "
+                "WHERE source = ? AND id = ?",
+                updates
+            )
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO engagement_history ({', '.join(ENGAGEMENT_COLUMNS)}, source, id, observed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [update + [observed_at] for update in updates]
+            )
+            self._db.commit()
+        return len(updates)
+
+    def update_sentiment(self, updates, now=None):
+        """Overwrite scores, given as [(source, id, sentiment, compound_score)].
+
+        Each mention's counts move from its old sentiment's rollup buckets to
+        the new one's. Buckets already dropped by retention are left alone.
+        Returns how many stored mentions were updated.
+        """
+        now = now or time.time()
+        since = {}
+        for resolution in RESOLUTIONS:
+            retention_days = Config.ROLLUP_RETENTION_DAYS.get(resolution)
+            since[resolution] = 0 if retention_days is None else ceil_bucket(now - retention_days * 24 * 3600, resolution)
+        with self._lock:
+            old_rows, new_rows, changes = [], [], []
+            for source, mention_id, sentiment, compound_score in updates:
+                row = self._db.execute(
+                    f"SELECT {', '.join(ROLLUP_SOURCE_COLUMNS)} FROM mentions WHERE source = ? AND id = ?",
+                    (source, str(mention_id))
+                ).fetchone()
+                if row is None:
+                    continue
+                timestamp, platform, _, _, engagement, followers_count = row
+                old_rows.append(tuple(row))
+                new_rows.append((timestamp, platform, sentiment, compound_score, engagement, followers_count))
+                changes.append((sentiment, compound_score, source, str(mention_id)))
+
+            deltas = self._rollup_deltas(new_rows, since)
+            for key, values in self._rollup_deltas(old_rows, since).items():
+                bucket = deltas.setdefault(key, [0, 0.0, 0, 0])
+                for i, value in enumerate(values):
+                    bucket[i] -= value
+            self._apply_rollup_deltas({key: values for key, values in deltas.items() if any(values)})
+            self._db.execute("DELETE FROM mention_rollups WHERE count <= 0")
+            self._db.executemany(
+                "UPDATE mentions SET sentiment = ?, compound_score = ? WHERE source = ? AND id = ?",
+                changes
+            )
+            self._db.commit()
+        return len(changes)
+
+    @staticmethod
+    def _rollup_deltas(rows, since=None):
+        """{(resolution, bucket, platform, sentiment): [count, compound, engagement, influencers]}
+
+        With `since` ({resolution: epoch}), rows before a tier's bound are
+        left out of that tier.
+        """
+        deltas = {}
+        for timestamp, platform, sentiment, compound_score, engagement, followers_count in rows:
+            for resolution in RESOLUTIONS:
+                if since and timestamp < since[resolution]:
+                    continue
+                key = (resolution, bucket_start(timestamp, resolution), platform, sentiment or '')
+                bucket = deltas.setdefault(key, [0, 0.0, 0, 0])
+                bucket[0] += 1
+                bucket[1] += compound_score or 0.0
+                bucket[2] += engagement or 0
+                bucket[3] += (followers_count or 0) > Config.MIN_FOLLOWER_COUNT
+        return deltas
+
+    def _apply_rollup_deltas(self, deltas):
+        self._db.executemany(
+            "INSERT INTO mention_rollups "
+            "(resolution, bucket, platform, sentiment, count, compound_sum, engagement_sum, influencer_count) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (resolution, bucket, platform, sentiment) DO UPDATE SET "
+            "count = count + excluded.count, "
+            "compound_sum = compound_sum + excluded.compound_sum, "
+            "engagement_sum = engagement_sum + excluded.engagement_sum, "
+            "influencer_count = influencer_count + excluded.influencer_count",
+            [(*key, *values) for key, values in deltas.items()]
+        )
+
+    def rebuild_rollups(self, batch_size=10000):
+        """Recompute mention_rollups from the stored mentions.
+
+        Buckets that began before the compaction horizon keep their stored
+        values, since their raw mentions are gone.
+        """
+        horizon = self.compacted_before()
+        since = {resolution: ceil_bucket(horizon or 0, resolution) for resolution in RESOLUTIONS}
+        with self._lock:
+            for resolution in RESOLUTIONS:
+                self._db.execute(
+                    "DELETE FROM mention_rollups WHERE resolution = ? AND bucket >= ?",
+                    (resolution, since[resolution])
+                )
+            cursor = self._db.execute(
+                f"SELECT {', '.join(ROLLUP_SOURCE_COLUMNS)} FROM mentions WHERE timestamp >= ?",
+                (min(since.values()),)
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                self._apply_rollup_deltas(self._rollup_deltas(rows, since))
+            self._db.commit()
+
+    def apply_retention(self, now=None):
+        """Drop raw mentions and rollup buckets past their retention.
+
+        Mentions older than RAW_MENTION_RETENTION_DAYS (and their engagement
+        history) are deleted; their counts live on in the rollups. Hourly and
+        daily buckets are kept for ROLLUP_RETENTION_DAYS of their tier.
+        """
+        now = now or time.time()
+        raw_cutoff = now - Config.RAW_MENTION_RETENTION_DAYS * 24 * 3600
+        report = {'mentions': 0, 'buckets': 0}
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM engagement_history WHERE (source, id) IN "
+                "(SELECT source, id FROM mentions WHERE timestamp < ?)",
+                (raw_cutoff,)
+            )
+            report['mentions'] = self._db.execute("DELETE FROM mentions WHERE timestamp < ?", (raw_cutoff,)).rowcount
+            for resolution, retention_days in Config.ROLLUP_RETENTION_DAYS.items():
+                if retention_days is None:
+                    continue
+                report['buckets'] += self._db.execute(
+                    "DELETE FROM mention_rollups WHERE resolution = ? AND bucket < ?",
+                    (resolution, now - retention_days * 24 * 3600)
+                ).rowcount
+            self._db.execute(
+                "INSERT INTO store_meta (key, value) VALUES ('compacted_before', ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = MAX(value, excluded.value)",
+                (raw_cutoff,)
+            )
+            self._db.commit()
+        return report
+
+    def compacted_before(self):
+        """Epoch before which raw mentions have been compacted away, or None"""
+        with self._lock:
+            row = self._db.execute("SELECT value FROM store_meta WHERE key = 'compacted_before'").fetchone()
+        return None if row is None else row['value']
+
+    def query_rollups(self, start=None, end=None, platforms=None, resolution='hour'):
+        """Buckets of one tier starting in [start, end), as MentionRollups"""
+        clauses, params = ["resolution = ?"], [resolution]
+        if start is not None:
+            clauses.append("bucket >= ?")
+            params.append(start.timestamp())
+        if end is not None:
+            clauses.append("bucket < ?")
+            params.append(end.timestamp())
+        if platforms is not None:
+            clauses.append(f"platform IN ({', '.join('?' for _ in platforms)})")
+            params.extend(platforms)
+
+        sql = ("SELECT bucket, platform, sentiment, count, compound_sum, engagement_sum, influencer_count "
+               "FROM mention_rollups WHERE " + " AND ".join(clauses) + " ORDER BY bucket")
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return MentionRollups.from_rows([tuple(row) for row in rows], resolution)
+
+    def engagement_history(self, source, mention_id):
+        """Every engagement observation of one mention, oldest first"""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT observed_at, {', '.join(ENGAGEMENT_COLUMNS)} FROM engagement_history "
+                "WHERE source = ? AND id = ? ORDER BY observed_at",
+                (source, str(mention_id))
+            ).fetchall()
+        history = []
+        for row in rows:
+            observation = dict(row)
+            observation['observed_at'] = datetime.fromtimestamp(observation['observed_at'])
+            history.append(observation)
+        return history
+
+    def query(self, start=None, end=None, platforms=None, sentiments=None, limit=None):
+        """Return mentions in [start, end), newest first, optionally filtered"""
+        return [self._to_mention(row) for row in self._select(start, end, platforms, sentiments, limit)]
+
+    def query_frame(self, start=None, end=None, platforms=None, sentiments=None, limit=None):
+        """Like query(), but as a columnar MentionFrame without per-row dicts"""
+        rows = self._select(start, end, platforms, sentiments, limit)
+        return MentionFrame.from_rows(COLUMNS, [tuple(row) for row in rows])
+
+    def _select(self, start, end, platforms, sentiments, limit):
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start.timestamp())
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(end.timestamp())
+        if platforms is not None:
+            clauses.append(f"platform IN ({', '.join('?' for _ in platforms)})")
+            params.extend(platforms)
+        if sentiments is not None:
+            clauses.append(f"sentiment IN ({', '.join('?' for _ in sentiments)})")
+            params.extend(sentiments)
+
+        sql = f"SELECT {', '.join(COLUMNS)} FROM mentions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def iter_mentions(self, batch_size=1000):
+        """Stream every stored mention, oldest first, without loading them all"""
+        for _, mention in self.iter_keyed_mentions(batch_size):
+            yield mention
+
+    def iter_keyed_mentions(self, batch_size=1000, after=None):
+        """Like iter_mentions(), as ((timestamp, source, id), mention) pairs.
+
+        The key is the mention's stable sort position, so a reader can resume
+        after any key it has seen (`after`) even if rows were inserted or
+        deleted in between.
+        """
+        last_key = tuple(after) if after is not None else (-1.0, '', '')
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    f"SELECT {', '.join(COLUMNS)} FROM mentions "
+                    "WHERE (timestamp, source, id) > (?, ?, ?) "
+                    "ORDER BY timestamp, source, id LIMIT ?",
+                    (*last_key, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield (row['timestamp'], row['source'], row['id']), self._to_mention(row)
+            last = rows[-1]
+            last_key = (last['timestamp'], last['source'], last['id'])
+
+    def data_version(self):
+        """Changes whenever mentions are added or engagement is refreshed"""
+        with self._lock:
+            return tuple(self._db.execute(
+                "SELECT COUNT(*), MAX(observed_at) FROM engagement_history"
+            ).fetchone())
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM mentions").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def _to_row(mention, ingested_at):
+        row = []
+        for column in COLUMNS:
+            value = mention.get(column)
+            if column == 'timestamp':
+                value = value.timestamp()
+            elif column == 'source' and value is None:
+                value = mention.get('platform', '')
+            elif column == 'id':
+                value = str(value)
+            row.append(value)
+        row.append(ingested_at)
+        return row
+
+    def _to_mention(self, row):
+        mention = dict(row)
+        if self.compact:
+            return MentionRecord(**mention)
+        mention['timestamp'] = datetime.fromtimestamp(mention['timestamp'])
+        return mention
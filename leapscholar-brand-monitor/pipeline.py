@@ -0,0 +1,169 @@
+import queue
+import threading
+import time
+
+from config import Config
+
+_END = object()
+_POLL_SECONDS = 0.1  # How often blocked buffer reads and writes check for a stop
+
+
+class StageStats:
+    """Throughput counters for one pipeline stage.
+
+    queue_depth / max_queue_depth describe the stage's output buffer, i.e.
+    batches produced but not yet picked up by the next stage.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.items_in = 0
+        self.items_out = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+
+    def observe_depth(self, depth):
+        self.queue_depth = depth
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def as_dict(self):
+        return {
+            'items_in': self.items_in,
+            'items_out': self.items_out,
+            'batches': self.batches,
+            'busy_seconds': self.busy_seconds,
+            'items_per_sec': self.items_in / self.busy_seconds if self.busy_seconds > 0 else 0,
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth
+        }
+
+
+class _Failure:
+    def __init__(self, error):
+        self.error = error
+
+
+def buffered(batches, maxsize, stats, stop=None, threads=None):
+    """Run an upstream generator in its own thread behind a bounded queue.
+
+    The producer blocks once `maxsize` batches are waiting, so memory stays
+    bounded by the buffer size rather than by the number of mentions. Once
+    `stop` is set both sides give up waiting, and the producer closes the
+    upstream generator so its cleanup runs. The thread is appended to
+    `threads` for the caller to join.
+    """
+    stop = stop or threading.Event()
+    buffer = queue.Queue(maxsize=maxsize)
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for batch in batches:
+                if not put(batch):
+                    return
+                stats.observe_depth(buffer.qsize())
+        except BaseException as e:
+            put(_Failure(e))
+        finally:
+            if hasattr(batches, 'close'):
+                batches.close()
+            put(_END)
+
+    thread = threading.Thread(target=produce, name=f"pipeline-{stats.name}", daemon=True)
+    if threads is not None:
+        threads.append(thread)
+    thread.start()
+
+    while not stop.is_set():
+        try:
+            batch = buffer.get(timeout=_POLL_SECONDS)
+        except queue.Empty:
+            continue
+        stats.observe_depth(buffer.qsize())
+        if batch is _END:
+            return
+        if isinstance(batch, _Failure):
+            raise batch.error
+        yield batch
+
+
+def run_stage(stats, process, batches):
+    """Apply `process` to each batch, timing it and skipping empty outputs"""
+    for batch in batches:
+        start = time.perf_counter()
+        output = process(batch)
+        stats.busy_seconds += time.perf_counter() - start
+        stats.batches += 1
+        stats.items_in += len(batch)
+        stats.items_out += len(output)
+        if output:
+            yield output
+
+
+class Pipeline:
+    """Chain of batch stages connected by bounded buffers.
+
+    `source` yields lists of mentions; each stage is a (name, function)
+    pair mapping a batch to a (possibly smaller) batch. Every stage runs in
+    its own thread, reading from the buffer filled by the stage before it.
+    If any stage raises, every stage thread is stopped and joined and the
+    source is closed before the error propagates.
+    """
+
+    def __init__(self, source, stages, buffer_size=None):
+        self.source = source
+        self.stages = stages
+        self.buffer_size = buffer_size or Config.PIPELINE_BUFFER_BATCHES
+        self.stats = {}
+
+    def run(self):
+        """Drain the pipeline and return per-stage stats"""
+        source_stats = StageStats('collect')
+        self.stats = {'collect': source_stats}
+
+        def counted_source():
+            source = iter(self.source)
+            try:
+                start = time.perf_counter()
+                for batch in source:
+                    source_stats.busy_seconds += time.perf_counter() - start
+                    source_stats.batches += 1
+                    source_stats.items_in += len(batch)
+                    source_stats.items_out += len(batch)
+                    yield batch
+                    start = time.perf_counter()
+            finally:
+                if hasattr(source, 'close'):
+                    source.close()
+
+        stop = threading.Event()
+        threads = []
+        batches = counted_source()
+        upstream_stats = source_stats
+        for name, process in self.stages:
+            stats = StageStats(name)
+            self.stats[name] = stats
+            # The buffer in front of a stage holds what the previous stage produced
+            batches = run_stage(stats, process, buffered(batches, self.buffer_size, upstream_stats, stop, threads))
+            upstream_stats = stats
+
+        try:
+            for _ in batches:
+                pass
+        finally:
+            stop.set()
+            batches.close()
+            for thread in threads:
+                thread.join()
+
+        return {name: stats.as_dict() for name, stats in self.stats.items()}
@@ -0,0 +1,115 @@
+import threading
+import time
+
+from config import Config
+
+
+class PollScheduler:
+    """Per-source polling cadence driven by arrivals, quota and spikes.
+
+    Each source's next poll is chosen from:
+      - its smoothed arrival rate, so roughly `target_per_poll` new mentions
+        are waiting at each poll (clamped to [min_interval, max_interval]);
+      - an active spike (or an arrival surge), which drops it to min_interval;
+      - its rate-limit budget: polls never outpace the token bucket's refill
+        rate, except that a spike may spend tokens already saved up.
+    The reasoning behind every choice is kept in `decisions`. Pass a fake
+    `clock` to drive it in simulated time.
+    """
+
+    def __init__(self, sources, rate_limiters=None, min_interval=None, max_interval=None,
+                 target_per_poll=None, smoothing=None, surge_factor=None, clock=time.time):
+        self.rate_limiters = rate_limiters or {}
+        self.min_interval = min_interval or Config.POLL_MIN_INTERVAL_SECONDS
+        self.max_interval = max(max_interval or Config.POLL_MAX_INTERVAL_SECONDS, self.min_interval)
+        self.target_per_poll = target_per_poll or Config.POLL_TARGET_MENTIONS_PER_POLL
+        self.smoothing = smoothing or Config.POLL_RATE_SMOOTHING
+        self.surge_factor = surge_factor or Config.POLL_SURGE_FACTOR
+        self.clock = clock
+        self._lock = threading.Lock()
+
+        now = clock()
+        self.arrival_rates = {}  # source -> smoothed mentions per second
+        self.last_polled = {}
+        self.next_poll_at = {source: now for source in sources}  # Poll everything once at start
+        self.decisions = {}
+
+    def due(self, now=None):
+        """Sources whose next poll time has come"""
+        now = self.clock() if now is None else now
+        with self._lock:
+            return [source for source, at in self.next_poll_at.items() if at <= now]
+
+    def next_due_at(self):
+        with self._lock:
+            return min(self.next_poll_at.values()) if self.next_poll_at else None
+
+    def record_poll(self, source, new_mentions, spike=False, now=None):
+        """Update a source's arrival rate after a poll and schedule its next one"""
+        now = self.clock() if now is None else now
+        with self._lock:
+            previous = self.last_polled.get(source)
+            self.last_polled[source] = now
+
+            smoothed = self.arrival_rates.get(source)
+            surge = False
+            if previous is not None and now > previous:
+                observed = new_mentions / (now - previous)
+                if smoothed is None:
+                    smoothed = observed
+                else:
+                    surge = smoothed > 0 and observed > smoothed * self.surge_factor
+                    smoothed += self.smoothing * (observed - smoothed)
+                self.arrival_rates[source] = smoothed
+
+            interval, reason = self._interval(source, smoothed, spike or surge)
+            self.next_poll_at[source] = now + interval
+            self.decisions[source] = {
+                'interval': interval,
+                'reason': reason,
+                'next_poll_at': now + interval,
+                'new_mentions': new_mentions,
+                'arrival_rate_per_min': smoothed * 60 if smoothed is not None else None,
+                'spike': spike,
+                'surge': surge,
+                'budget_remaining': self._budget(source)[0]
+            }
+            return interval
+
+    def _budget(self, source):
+        """(tokens remaining, tokens per second) for the source's rate limiter"""
+        limiter = self.rate_limiters.get(source)
+        if limiter is None:
+            return None, None
+        return limiter.remaining(), limiter.rate
+
+    def _interval(self, source, arrival_rate, spike):
+        if spike:
+            interval, reason = self.min_interval, 'spike'
+        elif arrival_rate is None:
+            # Need a second poll before there is a rate to go on
+            interval, reason = self.min_interval, 'warmup'
+        elif arrival_rate == 0:
+            interval, reason = self.max_interval, 'quiet'
+        else:
+            interval, reason = self.target_per_poll / arrival_rate, 'arrival_rate'
+            if interval < self.min_interval:
+                interval, reason = self.min_interval, 'min_interval'
+            elif interval > self.max_interval:
+                interval, reason = self.max_interval, 'max_interval'
+
+        remaining, refill_rate = self._budget(source)
+        if refill_rate:
+            # Spend no faster than the quota refills; a spike may use saved-up burst tokens
+            if spike and remaining >= 2:
+                floor = 0
+            else:
+                floor = max(1 / refill_rate, (1 - remaining) / refill_rate)
+            if floor > interval:
+                interval, reason = floor, 'rate_limit'
+        return interval, reason
+
+    def snapshot(self):
+        """Copy of the current decisions, for status pages and tests"""
+        with self._lock:
+            return {source: dict(decision) for source, decision in self.decisions.items()}
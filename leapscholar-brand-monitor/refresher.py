@@ -0,0 +1,75 @@
+import threading
+import time
+
+
+class BackgroundRefresher:
+    """Stale-while-revalidate wrapper around an expensive refresh function.
+
+    The first call waits for a refresh since there is nothing to serve
+    yet, joining one that is already running rather than starting another.
+    After that, a stale snapshot is returned immediately while a single
+    background thread refreshes it; concurrent callers that find the
+    snapshot stale share that one refresh instead of starting their own.
+    A failed refresh keeps the last good snapshot and records the error.
+    """
+
+    def __init__(self, refresh, ttl_seconds, clock=time.time):
+        self.refresh = refresh
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.value = None
+        self.refreshed_at = None  # Last successful refresh
+        self.checked_at = None  # Last attempt, successful or not
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def refreshing(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def age(self):
+        """Seconds since the snapshot was last refreshed, or None if never"""
+        if self.refreshed_at is None:
+            return None
+        return self.clock() - self.refreshed_at
+
+    def is_stale(self):
+        # Failed attempts count too, so errors are retried at the TTL rather than on every call
+        return self.checked_at is None or self.clock() - self.checked_at >= self.ttl_seconds
+
+    def get(self):
+        """Return the current snapshot, refreshing it in the background if stale"""
+        if self.checked_at is None:
+            # Nothing to serve yet: wait for a refresh, joining one already running
+            self.refresh_async()
+            self.wait()
+            return self.value
+
+        if self.is_stale():
+            self.refresh_async()
+        return self.value
+
+    def refresh_async(self):
+        """Start a background refresh unless one is already running"""
+        with self._lock:
+            if self.refreshing:
+                return False
+            self._thread = threading.Thread(target=self._run, name="snapshot-refresh", daemon=True)
+            self._thread.start()
+            return True
+
+    def wait(self, timeout=None):
+        """Block until the running background refresh (if any) finishes"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        try:
+            self.value = self.refresh()
+            self.refreshed_at = self.clock()
+            self.last_error = None
+        except Exception as e:
+            self.last_error = e
+        self.checked_at = self.clock()
@@ -0,0 +1,210 @@
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from dateutil.tz import tzlocal
+
+from config import Config
+from mention_frame import cutoff_seconds
+
+ROLLUP_COLUMNS = ['bucket', 'platform', 'sentiment', 'count', 'compound_sum', 'engagement_sum', 'influencer_count']
+RESOLUTIONS = ['week', 'day', 'hour']  # Coarsest first
+BUCKET_SECONDS = {'hour': 3600, 'day': 24 * 3600, 'week': 7 * 24 * 3600}
+
+
+def bucket_start(timestamp, resolution='hour'):
+    """Epoch second at which the local-time hour, day or week (from Monday)
+    containing `timestamp` began"""
+    if isinstance(timestamp, datetime):
+        timestamp = timestamp.timestamp()
+    seconds = int(np.floor(timestamp))
+    local = datetime.fromtimestamp(seconds)
+    if resolution == 'hour':
+        return seconds - (local.minute * 60 + local.second)
+    day = local.date()
+    if resolution == 'week':
+        day -= timedelta(days=day.weekday())
+    return int(datetime.combine(day, datetime.min.time()).timestamp())
+
+
+def next_bucket_start(bucket, resolution='hour'):
+    """Start of the bucket following the one starting at `bucket`"""
+    if resolution == 'hour':
+        return bucket + BUCKET_SECONDS['hour']
+    day = datetime.fromtimestamp(bucket).date() + timedelta(days=BUCKET_SECONDS[resolution] // (24 * 3600))
+    return int(datetime.combine(day, datetime.min.time()).timestamp())
+
+
+def ceil_bucket(value, resolution='hour'):
+    """First bucket boundary at or after a datetime/epoch bound"""
+    seconds = cutoff_seconds(value)
+    start = bucket_start(seconds, resolution)
+    return start if start == seconds else next_bucket_start(start, resolution)
+
+
+def bucket_starts(timestamps, resolution='hour'):
+    """Vectorized bucket_start over an array of epoch seconds"""
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    if not len(timestamps):
+        return timestamps
+    wall = pd.to_datetime(timestamps, unit='s', utc=True).tz_convert(tzlocal()).tz_localize(None)
+    wall_seconds = wall.to_numpy().astype('datetime64[s]').astype(np.int64)
+    if resolution == 'hour':
+        return timestamps - wall_seconds % BUCKET_SECONDS['hour']
+    # Few distinct local days: resolve each once with the scalar version
+    _, first_rows, inverse = np.unique(wall_seconds // BUCKET_SECONDS['day'], return_index=True, return_inverse=True)
+    starts = np.array([bucket_start(timestamps[row], resolution) for row in first_rows], dtype=np.int64)
+    return starts[inverse]
+
+
+class MentionRollups:
+    """Per (bucket, platform, sentiment) mention aggregates at one resolution.
+
+    Holds count, compound-score sum, engagement sum and influencer count
+    (followers above MIN_FOLLOWER_COUNT) per bucket, so dashboard metrics
+    cost O(buckets) instead of O(mentions). Buckets are local-time hours,
+    days or weeks, identified by their starting epoch second.
+    """
+
+    def __init__(self, columns, resolution='hour'):
+        self.columns = columns
+        self.resolution = resolution
+
+    @classmethod
+    def from_rows(cls, rows, resolution='hour'):
+        values = list(zip(*rows)) if rows else [()] * len(ROLLUP_COLUMNS)
+        data = dict(zip(ROLLUP_COLUMNS, values))
+        return cls({
+            'bucket': np.asarray(data['bucket'], dtype=np.int64),
+            'platform': np.asarray(data['platform'], dtype=object),
+            'sentiment': np.asarray(data['sentiment'], dtype=object),
+            'count': np.asarray(data['count'], dtype=np.int64),
+            'compound_sum': np.asarray(data['compound_sum'], dtype=np.float64),
+            'engagement_sum': np.asarray(data['engagement_sum'], dtype=np.int64),
+            'influencer_count': np.asarray(data['influencer_count'], dtype=np.int64)
+        }, resolution)
+
+    @classmethod
+    def from_frame(cls, frame, resolution='hour'):
+        """Aggregate a MentionFrame into buckets"""
+        if not len(frame):
+            return cls.from_rows([], resolution)
+        grouped = pd.DataFrame({
+            'bucket': bucket_starts(frame['timestamp'], resolution),
+            'platform': np.asarray(frame['platform'], dtype=object),
+            'sentiment': np.asarray(frame['sentiment'], dtype=object),
+            'count': 1,
+            'compound_sum': frame['compound_score'],
+            'engagement_sum': frame['engagement'],
+            'influencer_count': (frame['followers_count'] > Config.MIN_FOLLOWER_COUNT).astype(np.int64)
+        }).groupby(['bucket', 'platform', 'sentiment'], sort=True).sum().reset_index()
+        return cls({name: grouped[name].to_numpy() for name in ROLLUP_COLUMNS}, resolution)
+
+    @classmethod
+    def concat(cls, rollups, resolution='hour'):
+        """Join rollups; with mixed resolutions `resolution` is the coarsest"""
+        rollups = list(rollups) or [cls.from_rows([], resolution)]
+        return cls({
+            name: np.concatenate([r.columns[name] for r in rollups])
+            for name in ROLLUP_COLUMNS
+        }, resolution)
+
+    def __len__(self):
+        return len(self.columns['bucket'])
+
+    def filter(self, start=None, end=None, platforms=None):
+        """Buckets starting in [start, end) on the given platforms"""
+        keep = np.ones(len(self), dtype=bool)
+        if start is not None:
+            keep &= self.columns['bucket'] >= cutoff_seconds(start)
+        if end is not None:
+            keep &= self.columns['bucket'] < cutoff_seconds(end)
+        if platforms is not None:
+            keep &= np.isin(self.columns['platform'], list(platforms))
+        return MentionRollups({name: column[keep] for name, column in self.columns.items()}, self.resolution)
+
+    def total(self, column='count'):
+        return self.columns[column].sum()
+
+    def sentiment_totals(self, column='count'):
+        """{sentiment: summed column}, for the sentiments present"""
+        totals = {}
+        for sentiment, value in zip(self.columns['sentiment'], self.columns[column]):
+            totals[sentiment] = totals.get(sentiment, 0) + value
+        return {sentiment: value for sentiment, value in sorted(totals.items()) if value}
+
+    def bucket_totals(self, resolution=None, by_platform=False):
+        """DataFrame of time[, platform], count, positive, influencer_count per
+        bucket of `resolution` (default: this one), in local time"""
+        buckets = bucket_starts(self.columns['bucket'], resolution or self.resolution)
+        frame = pd.DataFrame({
+            'time': pd.to_datetime(buckets, unit='s', utc=True).tz_convert(tzlocal()).tz_localize(None),
+            'platform': self.columns['platform'],
+            'count': self.columns['count'],
+            'positive': np.where(self.columns['sentiment'] == 'positive', self.columns['count'], 0),
+            'influencer_count': self.columns['influencer_count']
+        })
+        keys = ['time', 'platform'] if by_platform else ['time']
+        return frame.drop(columns=[] if by_platform else ['platform']).groupby(keys).sum().reset_index()
+
+    def series(self, resolution=None):
+        """DataFrame of time, sentiment, count per bucket of `resolution`
+        (default: this one), in local time"""
+        buckets = bucket_starts(self.columns['bucket'], resolution or self.resolution)
+        times = pd.to_datetime(buckets, unit='s', utc=True).tz_convert(tzlocal()).tz_localize(None)
+        frame = pd.DataFrame({'time': times, 'sentiment': self.columns['sentiment'], 'count': self.columns['count']})
+        return frame.groupby(['time', 'sentiment']).sum().reset_index()
+
+
+class RollupTiers:
+    """Hourly, daily and weekly rollups answering range queries together.
+
+    between() covers a range with the whole buckets of the requested tier
+    and fills the partial buckets at either edge from ever finer tiers, and
+    finally from raw mentions via raw(start, end, platforms). Totals are
+    therefore exact wherever the finer tiers still hold the edges.
+    """
+
+    def __init__(self, tiers, raw):
+        self.tiers = tiers  # resolution -> MentionRollups
+        self.raw = raw
+
+    def resolution_for(self, start, end=None, min_points=None, now=None):
+        """Coarsest tier that still holds data back to `start` and splits
+        [start, end) into at least `min_points` buckets"""
+        min_points = min_points or Config.TREND_CHART_MIN_POINTS
+        now = now or time.time()
+        start_seconds = cutoff_seconds(start)
+        span = (now if end is None else cutoff_seconds(end)) - start_seconds
+
+        finest_available = 'week'
+        for resolution in RESOLUTIONS:
+            retention_days = Config.ROLLUP_RETENTION_DAYS.get(resolution)
+            if retention_days is not None and start_seconds < now - retention_days * 24 * 3600:
+                continue
+            finest_available = resolution
+            if span / BUCKET_SECONDS[resolution] >= min_points:
+                return resolution
+        return finest_available
+
+    def between(self, start=None, end=None, platforms=None, resolution='hour'):
+        """Buckets for [start, end), at `resolution` or finer"""
+        levels = RESOLUTIONS[RESOLUTIONS.index(resolution):]
+        return MentionRollups.concat(self._cover(start, end, platforms, levels), resolution)
+
+    def _cover(self, start, end, platforms, levels):
+        if not levels:
+            return [MentionRollups.from_frame(self.raw(start, end, platforms))]
+        resolution, finer = levels[0], levels[1:]
+        first = None if start is None else ceil_bucket(start, resolution)
+        last = None if end is None else bucket_start(cutoff_seconds(end), resolution)
+        if first is not None and last is not None and last <= first:
+            return self._cover(start, end, platforms, finer)
+
+        parts = [self.tiers[resolution].filter(first, last, platforms)]
+        if start is not None and first > cutoff_seconds(start):
+            parts += self._cover(start, first, platforms, finer)
+        if end is not None and cutoff_seconds(end) > last:
+            parts += self._cover(last, end, platforms, finer)
+        return parts
@@ -42,26 +42,47 @@ def setup_environment():
         print("   To enable AI features, create a .env file with your API keys.")
         return True
 
+def start_collector_worker():
+    """Start the background collector that feeds the shared mention store"""
+    print("🛰️  Starting background collector worker...")
+    return subprocess.Popen([sys.executable, "collector_worker.py"])
+
+def stop_collector_worker(worker):
+    """Stop the collector worker, waiting briefly for its current cycle"""
+    if worker is None or worker.poll() is not None:
+        return
+    worker.terminate()
+    try:
+        worker.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        worker.kill()
+
 def run_dashboard():
     """Run the Streamlit dashboard"""
+    worker = None
     try:
+        worker = start_collector_worker()
+        
         print("🚀 Starting LeapScholar Brand Monitor...")
         print("📊 Dashboard will open in your browser at http://localhost:8501")
         print("🔄 Press Ctrl+C to stop the dashboard")
         print("-" * 50)
         
-        # Run streamlit
+        # Run streamlit as a read-only consumer of the worker's store
+        env = dict(os.environ, EXTERNAL_COLLECTOR='true')
         subprocess.run([
             sys.executable, "-m", "streamlit", "run", "app.py",
             "--server.port", "8501",
             "--server.address", "localhost"
-        ])
+        ], env=env)
         
     except KeyboardInterrupt:
         print("\n👋 Dashboard stopped by user")
     except Exception as e:
         print(f"❌ Error running dashboard: {e}")
         return False
+    finally:
+        stop_collector_worker(worker)
     
     return True
 
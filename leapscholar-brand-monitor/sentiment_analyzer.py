@@ -1,29 +1,57 @@
 import pandas as pd
 import numpy as np
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from textblob import TextBlob
+from textblob.en import sentiment as pattern_sentiment
 import re
 from datetime import datetime, timedelta
+from config import Config
+from sentiment_cache import SentimentCache
+from mention_frame import MentionFrame
+from rollups import MentionRollups
+
+# Precompiled cleaning patterns shared by the single and batch paths
+URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+', flags=re.MULTILINE)
+HANDLE_PATTERN = re.compile(r'@\w+|#\w+')
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+
+# Bump whenever scoring logic changes so cached results are not reused
+SCORER_VERSION = 'vader+textblob-1'
+
+ENGINE_MODES = ('vader_only', 'both', 'tiered')
 
 class SentimentAnalyzer:
-    def __init__(self):
+    def __init__(self, cache=None, engine=None, tiered_margin=None):
         self.vader_analyzer = SentimentIntensityAnalyzer()
         
+        # Engine mode decides when the slower TextBlob pass runs
+        self.engine = engine or Config.SENTIMENT_ENGINE
+        if self.engine not in ENGINE_MODES:
+            raise ValueError(f"Unknown sentiment engine '{self.engine}', expected one of {ENGINE_MODES}")
+        self.tiered_margin = Config.SENTIMENT_TIERED_MARGIN if tiered_margin is None else tiered_margin
+        self.cache_namespace = f"{SCORER_VERSION}:{self.engine}"
+        if self.engine == 'tiered':
+            self.cache_namespace += f":{self.tiered_margin}"
+        
+        # Cache scored results by cleaned text; pass a SentimentCache to share one
+        if cache is None and Config.SENTIMENT_CACHE_ENABLED:
+            cache = SentimentCache(Config.SENTIMENT_CACHE_SIZE, Config.SENTIMENT_CACHE_PATH)
+        self.cache = cache
+        
     def clean_text(self, text):
         """Clean text for sentiment analysis"""
         if not text or not isinstance(text, str):
             return ""
         
         # Remove URLs, mentions, and special characters
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-        text = re.sub(r'@\w+|#\w+', '', text)
-        text = re.sub(r'[^\w\s]', '', text)
+        text = URL_PATTERN.sub('', text)
+        text = HANDLE_PATTERN.sub('', text)
+        text = PUNCTUATION_PATTERN.sub('', text)
         text = text.lower().strip()
         
         return text
     
     def analyze_sentiment(self, text):
-        """Analyze sentiment using both VADER and TextBlob"""
+        """Analyze sentiment using VADER and, depending on the engine mode, TextBlob"""
         cleaned_text = self.clean_text(text)
         
         if not cleaned_text:
@@ -36,36 +64,121 @@ class SentimentAnalyzer:
                 'confidence': 0
             }
         
+        if self.cache is None:
+            return self._score(cleaned_text)
+        
+        key = self.cache.make_key(cleaned_text, self.cache_namespace)
+        result = self.cache.get(key)
+        if result is None:
+            result = self._score(cleaned_text)
+            self.cache.put(key, result)
+        return result
+    
+    def _score(self, cleaned_text):
+        """Run the VADER and (depending on engine mode) TextBlob passes on cleaned text"""
         # VADER analysis
         vader_scores = self.vader_analyzer.polarity_scores(cleaned_text)
         
-        # TextBlob analysis
-        blob = TextBlob(cleaned_text)
-        textblob_polarity = blob.sentiment.polarity
-        textblob_subjectivity = blob.sentiment.subjectivity
-        
-        # Combine scores
-        compound_score = (vader_scores['compound'] + textblob_polarity) / 2
-        confidence = (1 - textblob_subjectivity) * 0.5 + 0.5  # Higher confidence for less subjective text
-        
-        # Determine sentiment category
-        if compound_score >= 0.05:
-            sentiment = 'positive'
-        elif compound_score <= -0.05:
-            sentiment = 'negative'
+        if self._needs_textblob(vader_scores['compound']):
+            # TextBlob analysis (pattern analyzer, without building a TextBlob)
+            textblob_polarity, textblob_subjectivity = pattern_sentiment(cleaned_text)
+            
+            # Combine scores
+            compound_score = (vader_scores['compound'] + textblob_polarity) / 2
+            confidence = (1 - textblob_subjectivity) * 0.5 + 0.5  # Higher confidence for less subjective text
         else:
-            sentiment = 'neutral'
+            textblob_polarity = textblob_subjectivity = None
+            compound_score = vader_scores['compound']
+            confidence = abs(compound_score) * 0.5 + 0.5  # Higher confidence for stronger VADER scores
         
-        return {
+        result = {
             'compound': compound_score,
             'positive': vader_scores['pos'],
             'negative': vader_scores['neg'],
             'neutral': vader_scores['neu'],
-            'sentiment': sentiment,
-            'confidence': confidence,
-            'textblob_polarity': textblob_polarity,
-            'textblob_subjectivity': textblob_subjectivity
+            'sentiment': self.classify(compound_score),
+            'confidence': confidence
         }
+        if textblob_polarity is not None:
+            result['textblob_polarity'] = textblob_polarity
+            result['textblob_subjectivity'] = textblob_subjectivity
+        return result
+    
+    def _needs_textblob(self, vader_compound):
+        """Decide whether the TextBlob pass runs for this VADER score"""
+        if self.engine == 'both':
+            return True
+        if self.engine == 'vader_only':
+            return False
+        # Tiered: only second-guess VADER when it lands near a label boundary
+        distance = abs(abs(vader_compound) - Config.SENTIMENT_THRESHOLD)
+        return distance < self.tiered_margin
+    
+    def classify(self, compound_score):
+        """Map a compound score to a sentiment category"""
+        if compound_score >= Config.SENTIMENT_THRESHOLD:
+            return 'positive'
+        elif compound_score <= -Config.SENTIMENT_THRESHOLD:
+            return 'negative'
+        return 'neutral'
+    
+    def analyze_batch(self, texts):
+        """Analyze many texts at once and return columnar NumPy results.
+        
+        Produces the same numbers as analyze_sentiment, one array element per
+        input text. Identical cleaned texts are only scored once, and texts
+        already in the cache are not scored at all. TextBlob columns are NaN
+        where the engine mode skipped the TextBlob pass or the cleaned text is
+        empty.
+        """
+        cleaned_texts = [self.clean_text(text) for text in texts]
+        size = len(cleaned_texts)
+        
+        columns = {
+            'compound': np.zeros(size),
+            'positive': np.zeros(size),
+            'negative': np.zeros(size),
+            'neutral': np.ones(size),
+            'confidence': np.zeros(size),
+            'textblob_polarity': np.full(size, np.nan),
+            'textblob_subjectivity': np.full(size, np.nan)
+        }
+        
+        # Group positions by cleaned text so repeated content is scored once
+        positions = {}
+        for i, cleaned_text in enumerate(cleaned_texts):
+            if cleaned_text:
+                positions.setdefault(cleaned_text, []).append(i)
+        
+        new_entries = []
+        for cleaned_text, idx in positions.items():
+            result = None
+            if self.cache is not None:
+                key = self.cache.make_key(cleaned_text, self.cache_namespace)
+                result = self.cache.get(key)
+            if result is None:
+                result = self._score(cleaned_text)
+                if self.cache is not None:
+                    new_entries.append((key, result))
+            for name, column in columns.items():
+                column[idx] = result.get(name, np.nan)
+        
+        if new_entries:
+            self.cache.put_many(new_entries)
+        
+        compound = columns['compound']
+        sentiment = np.full(size, 'neutral', dtype=object)
+        sentiment[compound >= Config.SENTIMENT_THRESHOLD] = 'positive'
+        sentiment[compound <= -Config.SENTIMENT_THRESHOLD] = 'negative'
+        columns['sentiment'] = sentiment
+        
+        return columns
+    
+    def analyze_dataframe(self, df, text_column='text'):
+        """Score a DataFrame text column and return a copy with sentiment columns added"""
+        results = self.analyze_batch(df[text_column].tolist())
+        results['compound_score'] = results.pop('compound')
+        return df.assign(**results)
     
     def get_mood_emoji(self, sentiment, compound_score):
         """Get mood emoji based on sentiment"""
@@ -84,24 +197,25 @@ class SentimentAnalyzer:
     
     def calculate_brand_pulse_score(self, mentions_data):
         """Calculate Brand Pulse Score (0-100) based on volume, positivity, and influencer impact"""
-        if not mentions_data:
+        mentions = MentionFrame.coerce(mentions_data)
+        if not len(mentions):
             return 0
         
-        total_mentions = len(mentions_data)
-        positive_mentions = sum(1 for mention in mentions_data if mention.get('sentiment') == 'positive')
-        negative_mentions = sum(1 for mention in mentions_data if mention.get('sentiment') == 'negative')
+        # Influencer impact counts mentions with high follower counts
+        return self.pulse_score_from_counts(
+            len(mentions),
+            mentions.count('sentiment', 'positive'),
+            int(np.count_nonzero(mentions['followers_count'] > Config.MIN_FOLLOWER_COUNT))
+        )
+    
+    def pulse_score_from_counts(self, total_mentions, positive_mentions, influencer_mentions):
+        """Brand Pulse Score from pre-aggregated counts (e.g. hourly rollups)"""
+        if not total_mentions:
+            return 0
         
         # Calculate positivity ratio
-        positivity_ratio = positive_mentions / total_mentions if total_mentions > 0 else 0
-        
-        # Calculate engagement score (simplified)
-        total_engagement = sum(mention.get('engagement', 0) for mention in mentions_data)
-        avg_engagement = total_engagement / total_mentions if total_mentions > 0 else 0
-        
-        # Calculate influencer impact (mentions with high follower counts)
-        influencer_mentions = sum(1 for mention in mentions_data 
-                               if mention.get('followers_count', 0) > 10000)
-        influencer_ratio = influencer_mentions / total_mentions if total_mentions > 0 else 0
+        positivity_ratio = positive_mentions / total_mentions
+        influencer_ratio = influencer_mentions / total_mentions
         
         # Combine scores (40% volume, 40% positivity, 20% influencer impact)
         volume_score = min(total_mentions / 100, 1) * 40  # Cap at 100 mentions
@@ -110,4 +224,27 @@ class SentimentAnalyzer:
         
         pulse_score = volume_score + positivity_score + influencer_score
         
-        return min(pulse_score, 100)  # Cap at 100 
\ No newline at end of file
+        return min(pulse_score, 100)  # Cap at 100
+    
+    def pulse_scores(self, total_mentions, positive_mentions, influencer_mentions):
+        """pulse_score_from_counts over arrays of per-bucket counts, all buckets at once"""
+        total = np.asarray(total_mentions, dtype=np.float64)
+        positive = np.asarray(positive_mentions, dtype=np.float64)
+        influencers = np.asarray(influencer_mentions, dtype=np.float64)
+        
+        # Same operations, in the same order, as the scalar version
+        with np.errstate(invalid='ignore', divide='ignore'):
+            volume_score = np.minimum(total / 100, 1) * 40
+            positivity_score = (positive / total) * 40
+            influencer_score = (influencers / total) * 20
+            pulse_score = np.minimum(volume_score + positivity_score + influencer_score, 100)
+        return np.where(total > 0, pulse_score, 0.0)
+    
+    def calculate_pulse_series(self, data, resolution=None, by_platform=False):
+        """Brand Pulse Score per hour/day/week bucket (optionally per platform),
+        from MentionRollups or from mentions"""
+        if not isinstance(data, MentionRollups):
+            data = MentionRollups.from_frame(MentionFrame.coerce(data), resolution or 'hour')
+        series = data.bucket_totals(resolution, by_platform)
+        series['pulse_score'] = self.pulse_scores(series['count'], series['positive'], series['influencer_count'])
+        return series 
\ No newline at end of file
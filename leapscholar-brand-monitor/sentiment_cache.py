@@ -0,0 +1,104 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+class SentimentCache:
+    """Content-addressed cache of sentiment results.
+
+    Results are keyed on a hash of the cleaned text. A bounded in-memory LRU
+    tier sits in front of an optional SQLite tier that survives restarts.
+    """
+
+    def __init__(self, max_size=10000, db_path=None):
+        self.max_size = max_size
+        self.db_path = db_path
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment_cache (key TEXT PRIMARY KEY, result TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(cleaned_text, namespace=''):
+        """Hash cleaned text (plus a scorer namespace) into a cache key"""
+        return hashlib.sha1(f"{namespace}\x00{cleaned_text}".encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return a cached result or None, promoting disk hits into memory"""
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self._counters['hits'] += 1
+                return dict(result)
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT result FROM sentiment_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    result = json.loads(row[0])
+                    self._remember(key, result)
+                    self._counters['disk_hits'] += 1
+                    return dict(result)
+
+            self._counters['misses'] += 1
+            return None
+
+    def put(self, key, result):
+        """Store a result in memory and, if configured, on disk"""
+        self.put_many([(key, result)])
+
+    def put_many(self, items):
+        """Store several (key, result) pairs with a single disk commit"""
+        with self._lock:
+            for key, result in items:
+                self._remember(key, dict(result))
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO sentiment_cache (key, result) VALUES (?, ?)",
+                    [(key, json.dumps(result)) for key, result in items]
+                )
+                self._db.commit()
+
+    def _remember(self, key, result):
+        """Insert into the LRU tier, evicting the oldest entries past max_size"""
+        if self.max_size <= 0:
+            return
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+            self._counters['evictions'] += 1
+
+    def clear(self):
+        """Drop every cached result from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM sentiment_cache")
+                self._db.commit()
+
+    def stats(self):
+        """Return hit/miss/eviction counters and the overall hit ratio"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats['memory_size'] = len(self._memory)
+        lookups = stats['hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_ratio'] = (stats['hits'] + stats['disk_hits']) / lookups if lookups else 0
+        return stats
+
+    def close(self):
+        """Close the SQLite tier"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,79 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from mention_frame import cutoff_seconds
+from mention_index import MentionIndex
+from rollups import RESOLUTIONS, MentionRollups, RollupTiers
+from spike_detector import SpikeDetector
+
+
+class MentionSnapshot:
+    """Immutable, versioned view of recent mentions shared by every session.
+
+    The rows live in one read-only Arrow table indexed by platform and time;
+    sessions hold a reference to it rather than a copy, so memory does not
+    grow with the number of users. `rollups` holds the store's hourly, daily
+    and weekly buckets read at the same data version; edges of ranges older
+    than the indexed window are read from `store`. `spike_detector` is
+    seeded once from the indexed mentions, so spike checks are O(1).
+    """
+
+    def __init__(self, frame, version, start=None, rollups=None, store=None):
+        self.version = version
+        self.created_at = time.time()
+        self.index = MentionIndex(frame, start=start, freeze=True)
+        if rollups is None:
+            rollups = {resolution: MentionRollups.from_frame(frame, resolution) for resolution in RESOLUTIONS}
+        self._store = store
+        self.rollups = RollupTiers(rollups, raw=self._raw)
+        self.spike_detector = SpikeDetector()
+        self.spike_detector.observe_frame(
+            self.index.select(start=self.created_at - max(self.spike_detector.windows) * 3600)
+        )
+
+    @property
+    def table(self):
+        return self.index.table
+
+    def __len__(self):
+        return len(self.index)
+
+    def _raw(self, start, end, platforms):
+        if self.index.covers(start) or self._store is None:
+            return self.index.select(start, end, platforms)
+        # Ranges reaching past the snapshot read the edge mentions from the store
+        return self._store.query_frame(
+            start=None if start is None else datetime.fromtimestamp(cutoff_seconds(start)),
+            end=None if end is None else datetime.fromtimestamp(cutoff_seconds(end)),
+            platforms=platforms
+        )
+
+
+class SnapshotPublisher:
+    """Publishes a new MentionSnapshot only when the store's data changes.
+
+    refresh() compares the store's data version with the current snapshot's
+    and keeps handing out the same object while nothing changed, so readers
+    can tell fresh data apart by identity or by `version`.
+    """
+
+    def __init__(self, store, window_days=30):
+        self.store = store
+        self.window = timedelta(days=window_days)
+        self.current = None
+        self.builds = 0
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        with self._lock:
+            version = self.store.data_version()
+            if self.current is None or self.current.version != version:
+                start = datetime.now() - self.window
+                self.current = MentionSnapshot(
+                    self.store.query_frame(start=start), version, start=start,
+                    rollups={resolution: self.store.query_rollups(resolution=resolution) for resolution in RESOLUTIONS},
+                    store=self.store
+                )
+                self.builds += 1
+            return self.current
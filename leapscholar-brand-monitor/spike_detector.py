@@ -0,0 +1,166 @@
+import threading
+import time
+
+import numpy as np
+
+from config import Config
+
+
+def spike_alert(positive_count, negative_count, total_count, threshold=None, min_volume=None):
+    """Alert dict when positive or negative mentions exceed `threshold` of
+    at least `min_volume` mentions, else None"""
+    threshold = Config.SPIKE_DETECTION_THRESHOLD if threshold is None else threshold
+    min_volume = Config.SPIKE_MIN_VOLUME if min_volume is None else min_volume
+    if not total_count or total_count < min_volume:
+        return None
+
+    for spike_type, count in (('positive_spike', positive_count), ('negative_spike', negative_count)):
+        if count / total_count > threshold:
+            return {
+                'type': spike_type,
+                'percentage': (count / total_count) * 100,
+                'count': int(count),
+                'total': int(total_count)
+            }
+    return None
+
+
+class RingCounter:
+    """Number of events in a sliding time window.
+
+    The window is split into `slots` equal time slots kept in a ring; the
+    running total is adjusted as events arrive and as slots fall out of the
+    window, so adding an event and reading the count are both O(1)
+    (amortized over elapsed slots). The window's trailing edge moves in
+    whole slots.
+    """
+
+    def __init__(self, window_seconds, slots=60):
+        self.slots = slots
+        self.width = window_seconds / slots
+        self.counts = np.zeros(slots, dtype=np.int64)
+        self.head = None  # Absolute index of the newest slot
+        self.total = 0
+
+    def _advance(self, slot):
+        if self.head is None:
+            self.head = slot
+            return
+        if slot <= self.head:
+            return
+        if slot - self.head >= self.slots:
+            self.counts[:] = 0
+            self.total = 0
+        else:
+            for expired in range(self.head + 1, slot + 1):
+                self.total -= int(self.counts[expired % self.slots])
+                self.counts[expired % self.slots] = 0
+        self.head = slot
+
+    def add(self, timestamp, count=1):
+        """Count an event; returns False if it is already outside the window"""
+        slot = int(timestamp // self.width)
+        self._advance(slot)
+        if slot <= self.head - self.slots:
+            return False
+        self.counts[slot % self.slots] += count
+        self.total += count
+        return True
+
+    def add_many(self, timestamps):
+        """Count a batch of events at once"""
+        if not len(timestamps):
+            return
+        slots = (np.asarray(timestamps) // self.width).astype(np.int64)
+        self._advance(int(slots.max()))
+        slots = slots[slots > self.head - self.slots]
+        np.add.at(self.counts, slots % self.slots, 1)
+        self.total += len(slots)
+
+    def count(self, now):
+        self._advance(int(now // self.width))
+        return self.total
+
+
+class SpikeDetector:
+    """Streaming sentiment-spike detector over several sliding windows.
+
+    Keeps one RingCounter per (window, source, platform, sentiment), fed as
+    mentions are ingested, so checking for a spike never rescans mentions.
+    A window alerts under spike_alert(): more than SPIKE_DETECTION_THRESHOLD
+    of its mentions share a sentiment, with at least SPIKE_MIN_VOLUME
+    mentions.
+    """
+
+    def __init__(self, windows_hours=None, slots=None, threshold=None, min_volume=None, clock=time.time):
+        self.windows = sorted(windows_hours or Config.SPIKE_WINDOWS_HOURS)
+        self.slots = slots or Config.SPIKE_WINDOW_SLOTS
+        self.threshold = threshold
+        self.min_volume = min_volume
+        self.clock = clock
+        self._counters = {}  # (window_hours, source, platform, sentiment) -> RingCounter
+        self._lock = threading.Lock()
+
+    def _counter(self, window_hours, key):
+        counter = self._counters.get((window_hours, *key))
+        if counter is None:
+            counter = self._counters[(window_hours, *key)] = RingCounter(window_hours * 3600, self.slots)
+        return counter
+
+    def observe(self, mentions):
+        """Count newly ingested mentions"""
+        with self._lock:
+            for mention in mentions:
+                key = (mention.get('source') or mention.get('platform'), mention.get('platform'), mention.get('sentiment'))
+                timestamp = mention['timestamp'].timestamp()
+                for window_hours in self.windows:
+                    self._counter(window_hours, key).add(timestamp)
+
+    def observe_frame(self, frame):
+        """Count every mention of a MentionFrame, one batch per key"""
+        if not len(frame):
+            return
+        columns = [frame[name] for name in ('source', 'platform', 'sentiment')]
+        keys, inverse = np.unique(np.stack([column.codes for column in columns], axis=1), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        timestamps = frame['timestamp']
+        with self._lock:
+            for position, codes in enumerate(keys):
+                key = tuple(column.categories[code] if code >= 0 else None for column, code in zip(columns, codes))
+                batch = timestamps[inverse == position]
+                for window_hours in self.windows:
+                    self._counter(window_hours, key).add_many(batch)
+
+    def counts(self, window_hours=24, platforms=None, sources=None):
+        """{sentiment: mentions in the window} for the given platforms/sources"""
+        now = self.clock()
+        totals = {}
+        with self._lock:
+            for (window, source, platform, sentiment), counter in self._counters.items():
+                if window != window_hours:
+                    continue
+                if platforms is not None and platform not in platforms:
+                    continue
+                if sources is not None and source not in sources:
+                    continue
+                totals[sentiment] = totals.get(sentiment, 0) + counter.count(now)
+        return totals
+
+    def check(self, window_hours=24, platforms=None, sources=None):
+        """Spike alert for one window, or None"""
+        counts = self.counts(window_hours, platforms, sources)
+        alert = spike_alert(
+            counts.get('positive', 0), counts.get('negative', 0), sum(counts.values()),
+            self.threshold, self.min_volume
+        )
+        if alert is not None:
+            alert['window_hours'] = window_hours
+        return alert
+
+    def alert(self, platforms=None, sources=None):
+        """Alert for the shortest window that spikes, or None"""
+        for window_hours in self.windows:
+            alert = self.check(window_hours, platforms, sources)
+            if alert is not None:
+                return alert
+        return None
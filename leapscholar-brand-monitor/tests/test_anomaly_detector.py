@@ -0,0 +1,44 @@
+import numpy as np
+
+from anomaly_detector import VolumeAnomalyDetector
+from rollups import MentionRollups, bucket_start
+
+DAYS = 35
+NOW = bucket_start(1_760_000_000, 'hour') + 1800
+
+
+def stationary_rollups(seed, burst=None, burst_size=25):
+    """DAYS of hourly buckets with uniform random counts per (platform, sentiment),
+    plus `burst_size` extra negative Twitter mentions `burst` hours before now"""
+    rng = np.random.default_rng(seed)
+    start = bucket_start(NOW, 'hour') - DAYS * 24 * 3600
+    rows = []
+    for hour in range(DAYS * 24 + 1):
+        bucket = start + hour * 3600
+        for platform in ('Twitter', 'Reddit'):
+            for sentiment in ('positive', 'negative', 'neutral'):
+                count = int(rng.integers(0, 6))
+                if burst is not None and hour == DAYS * 24 - burst and (platform, sentiment) == ('Twitter', 'negative'):
+                    count += burst_size
+                if count:
+                    rows.append((bucket, platform, sentiment, count, 0.0, 0, 0))
+    return MentionRollups.from_rows(rows)
+
+
+def test_stationary_volume_raises_no_alerts():
+    detector = VolumeAnomalyDetector()
+    for seed in range(5):
+        assert detector.backtest(stationary_rollups(seed), now=NOW).empty
+
+
+def test_injected_burst_is_flagged():
+    detector = VolumeAnomalyDetector()
+    rollups = stationary_rollups(0, burst=1)
+
+    anomalies = detector.backtest(rollups, now=NOW)
+    assert ('Twitter', 'negative') in set(zip(anomalies['platform'], anomalies['sentiment']))
+
+    alert = detector.alert(rollups, now=NOW)
+    assert (alert['type'], alert['platform'], alert['sentiment']) == ('volume_anomaly', 'Twitter', 'negative')
+    assert alert['count'] >= 25
+    assert alert['z'] >= detector.z_threshold
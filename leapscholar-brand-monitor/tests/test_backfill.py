@@ -0,0 +1,80 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from backfill import apply_backfill, run_backfill
+from config import Config
+from mention_store import MentionStore
+
+TEXTS = [
+    "LeapScholar support is terrible and slow, awful experience",
+    "LeapScholar helped me get my visa, amazing and wonderful team",
+    "LeapScholar has offices in several cities"
+]
+
+
+def mention(i, timestamp):
+    return {
+        'source': 'twitter', 'id': f"m{i}", 'platform': 'Twitter', 'text': TEXTS[i % len(TEXTS)],
+        'username': 'student', 'timestamp': timestamp, 'likes': 0, 'retweets': 0, 'comments': 0,
+        'engagement': 0, 'followers_count': 100, 'sentiment': 'neutral', 'compound_score': 0.0, 'url': ''
+    }
+
+
+def make_store(path, count):
+    store = MentionStore(str(path))
+    start = datetime.now() - timedelta(days=1)
+    store.append([mention(i, start + timedelta(minutes=i)) for i in range(count)])
+    return store
+
+
+def part_ids(output_dir):
+    ids = []
+    for path in sorted(output_dir.glob('part-*.jsonl')):
+        ids += [json.loads(line)['id'] for line in path.read_text().splitlines()]
+    return ids
+
+
+def test_resume_continues_after_last_finished_mention(tmp_path):
+    db_path, output_dir = tmp_path / 'mentions.db', tmp_path / 'rescored'
+    store = make_store(db_path, 6)
+    run_backfill(str(db_path), output_dir, workers=1, chunk_size=2)
+    assert part_ids(output_dir) == [f"m{i}" for i in range(6)]
+
+    # Pretend the run was killed with chunk 0 and chunk 2 written but chunk 1 not
+    checkpoint = json.loads((output_dir / 'checkpoint.json').read_text())
+    keys = [list(key) for key, _ in store.iter_keyed_mentions()]
+    checkpoint.update(chunks_done=1, resume_after=keys[1])
+    (output_dir / 'checkpoint.json').write_text(json.dumps(checkpoint))
+    (output_dir / 'part-000001.jsonl').unlink()
+
+    # Meanwhile retention dropped the oldest mention and a late one arrived
+    store.apply_retention(now=keys[0][0] + 0.5 + 120 * 24 * 3600)
+    store.append([mention(6, datetime.fromtimestamp(keys[3][0] + 1))])
+
+    stats = run_backfill(str(db_path), output_dir, workers=1, chunk_size=2)
+    assert sum(worker['mentions'] for worker in stats.values()) == 5
+    assert sorted(part_ids(output_dir)) == sorted(f"m{i}" for i in range(7))
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_apply_writes_scores_and_moves_rollups(tmp_path, monkeypatch, compact):
+    monkeypatch.setattr(Config, 'COMPACT_MENTION_RECORDS', compact)
+    db_path, output_dir = tmp_path / 'mentions.db', tmp_path / 'rescored'
+    make_store(db_path, 6).close()
+    run_backfill(str(db_path), output_dir, workers=1, chunk_size=4)
+
+    assert apply_backfill(str(db_path), output_dir) == 6
+    # Applying the same parts again changes nothing
+    assert apply_backfill(str(db_path), output_dir) == 6
+
+    store = MentionStore(str(db_path))
+    mentions = store.query()
+    assert {m['id']: m['sentiment'] for m in mentions}['m0'] == 'negative'
+    assert {m['id']: m['sentiment'] for m in mentions}['m1'] == 'positive'
+    by_sentiment = {}
+    for m in mentions:
+        by_sentiment[m['sentiment']] = by_sentiment.get(m['sentiment'], 0) + 1
+    for resolution in ('hour', 'day', 'week'):
+        assert store.query_rollups(resolution=resolution).sentiment_totals() == by_sentiment
@@ -0,0 +1,113 @@
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from data_collector import DataCollector
+from http_cache import HttpResponseCache
+from http_client import HttpClient, RateLimited
+from mention_store import MentionStore
+
+
+WORDS = [f"word{i}" for i in range(500)]
+
+
+def stub_text(source, i):
+    # Unrelated word salads, so dedup sees no near-duplicates
+    words = random.Random(f"{source}/{i}").sample(WORDS, 12)
+    return f"LeapScholar {' '.join(words)}"
+
+
+def stub_mentions(source, count):
+    now = datetime.now()
+    return [{
+        'id': f"{source}_{i}",
+        'text': stub_text(source, i),
+        'platform': 'Twitter',
+        'username': f"{source}_user_{i}",
+        'timestamp': now - timedelta(minutes=i + 1),
+        'likes': i,
+        'retweets': 0,
+        'comments': 0,
+        'engagement': i,
+        'followers_count': 100,
+        'url': f"https://example.com/{source}/{i}"
+    } for i in range(count)]
+
+
+@pytest.fixture
+def release_slow_source():
+    release = threading.Event()
+    yield release
+    release.set()
+
+
+def make_collector(sources, compact=False):
+    return DataCollector(
+        sources=sources,
+        http_client=HttpClient(rate_limiters={}, cache=HttpResponseCache()),
+        store=MentionStore(compact=compact)
+    )
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_slow_and_failing_sources_leave_partial_results(release_slow_source, compact):
+    def slow(cursor):
+        release_slow_source.wait(10)
+        return stub_mentions('slow', 3)
+
+    def failing(cursor):
+        raise RuntimeError("upstream returned garbage")
+
+    def rate_limited(cursor):
+        raise RateLimited('quota', 3600)
+
+    collector = make_collector([
+        ('slow', slow, 0.2),
+        ('failing', failing, 5),
+        ('quota', rate_limited, 5),
+        ('fast', lambda cursor: stub_mentions('fast', 4), 5)
+    ], compact=compact)
+
+    start = time.monotonic()
+    mentions, status = collector.get_all_mentions_with_status()
+    elapsed = time.monotonic() - start
+
+    # The slow source's deadline bounds the wait, not its response time
+    assert elapsed < 5
+    assert sorted(m['id'] for m in mentions) == [f"fast_{i}" for i in range(4)]
+    assert all(m['source'] == 'fast' for m in mentions)
+
+    assert status == collector.last_collection_status
+    assert status['fast'] == {'status': 'ok', 'count': 4, 'elapsed': status['fast']['elapsed']}
+    assert status['slow']['status'] == 'timeout'
+    assert status['slow']['count'] == 0
+    assert status['failing']['status'] == 'error'
+    assert 'upstream returned garbage' in status['failing']['error']
+    assert status['quota']['status'] == 'skipped'
+
+
+def test_status_covers_only_the_latest_collection():
+    cycles = []
+
+    def flaky(cursor):
+        if cycles:
+            raise RuntimeError("down")
+        cycles.append(cursor)
+        return stub_mentions('flaky', 2)
+
+    collector = make_collector([
+        ('steady', lambda cursor: stub_mentions('steady', 2), 5),
+        ('flaky', flaky, 5)
+    ])
+
+    _, status = collector.get_all_mentions_with_status()
+    assert {name: outcome['status'] for name, outcome in status.items()} == {'steady': 'ok', 'flaky': 'ok'}
+
+    # Mentions stored earlier keep their own source; only the outcome changes
+    mentions, status = collector.get_all_mentions_with_status()
+    assert {name: outcome['status'] for name, outcome in status.items()} == {'steady': 'ok', 'flaky': 'error'}
+    assert sorted(m['source'] for m in mentions) == ['flaky', 'flaky', 'steady', 'steady']
+    assert all('sources_answered' not in m for m in mentions)
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from engagement_refresher import EngagementRefresher
+from mention_store import MentionStore
+
+
+def mention(mention_id, timestamp, likes=0):
+    return {
+        'source': 'twitter', 'id': mention_id, 'platform': 'Twitter', 'text': f"LeapScholar {mention_id}",
+        'username': 'student', 'timestamp': timestamp, 'likes': likes, 'retweets': 0, 'comments': 0,
+        'engagement': likes, 'followers_count': 100, 'sentiment': 'positive', 'compound_score': 0.5, 'url': ''
+    }
+
+
+def test_append_seeds_history_for_inserted_rows_only():
+    store = MentionStore()
+    now = datetime.now()
+    assert store.append([mention('a', now, likes=3), mention('b', now)]) == 2
+    # Re-ingesting 'a' with other counts is ignored, as is a duplicate within the batch
+    assert store.append([mention('a', now, likes=50), mention('c', now), mention('c', now)]) == 1
+
+    history = store.engagement_history('twitter', 'a')
+    assert [observation['likes'] for observation in history] == [3]
+    assert len(store.engagement_history('twitter', 'c')) == 1
+    assert store.query_rollups(resolution='hour').total() == 3
+
+
+def test_refresh_records_velocity_and_history():
+    store = MentionStore()
+    clock = [datetime.now().timestamp()]
+    posted = datetime.fromtimestamp(clock[0]) - timedelta(hours=1)
+    store.append([mention('a', posted, likes=10)])
+
+    def fetch(source, mentions):
+        return {m['id']: {'likes': 40, 'retweets': 0, 'comments': 0} for m in mentions}
+
+    refresher = EngagementRefresher(store, fetch, sources=['twitter'], clock=lambda: clock[0])
+    tracked_at = clock[0]
+    assert refresher.track(store.query()) == 1
+
+    clock[0] = refresher.next_due_at()
+    elapsed_hours = (clock[0] - tracked_at) / 3600
+    assert refresher.run_due()['refreshed'] == 1
+
+    assert refresher.velocities[('twitter', 'a')] == pytest.approx((40 - 10) / elapsed_hours)
+    assert [observation['likes'] for observation in store.engagement_history('twitter', 'a')] == [10, 40]
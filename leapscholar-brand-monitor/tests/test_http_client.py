@@ -0,0 +1,139 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from http_cache import HttpResponseCache
+from http_client import HttpClient, RateLimited, TokenBucket, build_rate_limiters
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers /ok, fails /flaky once with a 503 and /busy once with a 429"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            server.client_ports.append(self.client_address[1])
+            first = server.hits[self.path] == 1
+        if self.path == '/flaky' and first:
+            self.reply(503)
+        elif self.path == '/busy' and first:
+            self.reply(429, {'Retry-After': '2'})
+        else:
+            self.reply(200)
+
+    def reply(self, status, headers=None):
+        body = b'{"status": %d}' % status
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.lock = threading.Lock()
+    server.hits = {}
+    server.client_ports = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def make_client(rate_limiters=None, **kwargs):
+    sleeps = []
+    client = HttpClient(rate_limiters=rate_limiters or {}, backoff_base=0.01, sleep=sleeps.append,
+                        cache=HttpResponseCache(), **kwargs)
+    return client, sleeps
+
+
+def url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_retries_server_errors(server):
+    client, sleeps = make_client()
+    response = client.get('reddit', url(server, '/flaky'))
+    assert response.status_code == 200
+    assert server.hits['/flaky'] == 2
+    assert client.stats['retries'] == 1
+    assert len(sleeps) == 1
+
+
+def test_honours_retry_after(server):
+    client, sleeps = make_client()
+    response = client.get('reddit', url(server, '/busy'))
+    assert response.status_code == 200
+    assert server.hits['/busy'] == 2
+    assert sleeps == [2.0]
+
+
+def test_gives_up_after_max_retries(server):
+    client, sleeps = make_client(max_retries=0)
+    response = client.get('reddit', url(server, '/flaky'))
+    assert response.status_code == 503
+    assert server.hits['/flaky'] == 1
+
+
+def test_reuses_connections(server):
+    client, _ = make_client()
+    for _ in range(5):
+        assert client.get('reddit', url(server, '/ok')).status_code == 200
+    assert len(set(server.client_ports)) == 1
+
+
+def test_rate_limit_waits_for_tokens(server):
+    clock = FakeClock()
+    limiter = TokenBucket(rate=1.0, capacity=2, clock=clock, sleep=clock.sleep)
+    client, _ = make_client({'reddit': limiter})
+    for _ in range(3):
+        client.get('reddit', url(server, '/ok'))
+    assert server.hits['/ok'] == 3
+    assert clock.now == pytest.approx(1.0)
+    assert client.stats['rate_limited_seconds'] == pytest.approx(1.0)
+
+
+def test_rate_limit_skips_requests_that_would_wait_too_long(server):
+    clock = FakeClock()
+    # One request per hour with a single token of burst
+    limiter = TokenBucket(rate=1 / 3600, capacity=1, clock=clock, sleep=clock.sleep)
+    client, _ = make_client({'google_news': limiter}, max_rate_limit_wait=5)
+    client.get('google_news', url(server, '/ok'))
+    with pytest.raises(RateLimited) as raised:
+        client.get('google_news', url(server, '/ok'))
+    assert raised.value.wait_seconds == pytest.approx(3600)
+    assert server.hits['/ok'] == 1
+    assert clock.now == 0.0
+
+
+def test_build_rate_limiters_rejects_non_positive_quotas():
+    class QuotaConfig:
+        REDDIT_CLIENT_ID = 'id'
+        PLATFORM_RATE_LIMITS = {'google_news': {'requests': 0, 'per_seconds': 30 * 24 * 3600, 'burst': 5}}
+
+    with pytest.raises(ValueError, match='google_news'):
+        build_rate_limiters(QuotaConfig)
@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+
+from mention_frame import MentionFrame
+from mention_index import MentionIndex
+
+NOW = datetime(2026, 3, 2, 12, 0)
+
+
+def mention(username, platform, hours_ago, followers, engagement=0):
+    return {
+        'source': platform.lower(), 'id': f"{username}-{platform}-{hours_ago}", 'platform': platform,
+        'username': username, 'text': 'LeapScholar', 'timestamp': NOW - timedelta(hours=hours_ago),
+        'followers_count': followers, 'engagement': engagement
+    }
+
+
+def indexed_frame():
+    # Ordered by the index: platform, then oldest first
+    return MentionIndex(MentionFrame.from_mentions([
+        mention('asha', 'Twitter', 1, followers=900, engagement=5),
+        mention('asha', 'Reddit', 30, followers=100, engagement=5),
+        mention('ben', 'Twitter', 5, followers=50, engagement=7),
+        mention('asha', 'Twitter', 48, followers=10, engagement=5),
+        mention('ben', 'Reddit', 2, followers=70)
+    ])).select()
+
+
+def test_latest_rows_picks_each_users_newest_mention():
+    frame = indexed_frame()
+    rows = frame.latest_rows('username')
+    assert [frame['username'][row] for row in rows] == ['asha', 'ben']
+    assert [int(frame['followers_count'][row]) for row in rows] == [900, 70]
+
+
+def test_top_breaks_ties_by_newest_mention():
+    frame = indexed_frame()
+    top = frame.top('engagement', 3)
+    assert [int(frame['engagement'][row]) for row in top] == [7, 5, 5]
+    assert [int(frame['followers_count'][row]) for row in top] == [50, 900, 100]
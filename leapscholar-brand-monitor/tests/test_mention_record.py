@@ -0,0 +1,49 @@
+import pickle
+from datetime import datetime
+
+import pytest
+
+from mention_record import FIELDS, MentionRecord
+from mention_store import MentionStore
+
+
+def record(**extra):
+    return MentionRecord(
+        source='twitter', id='1', platform='Twitter', text='LeapScholar', username='asha',
+        timestamp=datetime(2026, 3, 2, 12, 0), likes=3, engagement=3, sentiment='positive',
+        compound_score=0.5, **extra
+    )
+
+
+def test_reads_like_a_dict():
+    mention = record()
+    assert mention['timestamp'] == datetime(2026, 3, 2, 12, 0)
+    assert mention['likes'] == 3
+    assert mention.get('confidence') is None
+    assert 'confidence' not in mention
+    assert list(mention) == FIELDS
+    with pytest.raises(KeyError):
+        mention['confidence']
+
+
+def test_keeps_keys_outside_the_packed_fields():
+    mention = record(sources_answered=['twitter'])
+    mention['confidence'] = 0.8
+    mention.update({'sentiment': 'negative', 'likes': 7})
+
+    assert mention['confidence'] == 0.8
+    assert mention['sources_answered'] == ['twitter']
+    assert 'confidence' in mention
+    assert mention['sentiment'] == 'negative' and mention['likes'] == 7
+    assert list(mention) == FIELDS + ['sources_answered', 'confidence']
+    assert mention.to_dict()['confidence'] == 0.8
+    assert pickle.loads(pickle.dumps(mention)) == mention
+
+
+def test_compact_store_records_accept_extra_keys():
+    store = MentionStore(compact=True)
+    store.append([record().to_dict()])
+    mention = store.query()[0]
+    assert isinstance(mention, MentionRecord)
+    mention['confidence'] = 0.9
+    assert mention['confidence'] == 0.9
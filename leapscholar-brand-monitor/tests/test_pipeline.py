@@ -0,0 +1,44 @@
+import threading
+
+import pytest
+
+from pipeline import Pipeline
+
+
+def pipeline_threads():
+    return [thread for thread in threading.enumerate() if thread.name.startswith('pipeline-') and thread.is_alive()]
+
+
+def test_run_passes_every_batch_through_the_stages():
+    seen = []
+    pipeline = Pipeline(
+        ([i] for i in range(10)),
+        [('double', lambda batch: [value * 2 for value in batch]), ('sink', lambda batch: seen.extend(batch) or batch)],
+        buffer_size=2
+    )
+    stats = pipeline.run()
+    assert seen == [i * 2 for i in range(10)]
+    assert stats['collect']['items_out'] == 10
+    assert stats['sink']['items_out'] == 10
+    assert pipeline_threads() == []
+
+
+def test_failing_stage_stops_producers_and_closes_source():
+    source_closed = threading.Event()
+
+    def source():
+        try:
+            for i in range(1000):
+                yield [i]
+        finally:
+            source_closed.set()
+
+    def fail(batch):
+        raise RuntimeError("stage failed")
+
+    pipeline = Pipeline(source(), [('first', lambda batch: batch), ('second', fail)], buffer_size=2)
+    with pytest.raises(RuntimeError, match="stage failed"):
+        pipeline.run()
+
+    assert pipeline_threads() == []
+    assert source_closed.is_set()
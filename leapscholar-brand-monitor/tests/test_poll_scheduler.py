@@ -0,0 +1,84 @@
+from http_client import TokenBucket
+from poll_scheduler import PollScheduler
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def make_scheduler(clock, sources=('reddit',), rate_limiters=None):
+    return PollScheduler(list(sources), rate_limiters=rate_limiters, min_interval=60, max_interval=3600,
+                         target_per_poll=20, smoothing=0.5, surge_factor=3.0, clock=clock)
+
+
+def test_first_poll_is_due_immediately_then_warms_up():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, sources=('reddit', 'twitter'))
+    assert scheduler.due() == ['reddit', 'twitter']
+
+    assert scheduler.record_poll('reddit', 5) == 60
+    assert scheduler.snapshot()['reddit']['reason'] == 'warmup'
+    assert scheduler.due() == ['twitter']
+    clock.advance(60)
+    assert scheduler.due() == ['reddit', 'twitter']
+
+
+def test_interval_follows_arrival_rate_and_backs_off_when_quiet():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock)
+    scheduler.record_poll('reddit', 0)
+
+    # 20 mentions in 600s: the next 20 should be waiting after another 600s
+    clock.advance(600)
+    assert scheduler.record_poll('reddit', 20) == 600
+    assert scheduler.snapshot()['reddit']['reason'] == 'arrival_rate'
+
+    # More than surge_factor times the smoothed rate counts as a spike
+    clock.advance(600)
+    assert scheduler.record_poll('reddit', 100) == 60
+    decision = scheduler.snapshot()['reddit']
+    assert (decision['reason'], decision['surge']) == ('spike', True)
+
+    quiet = make_scheduler(clock)
+    quiet.record_poll('reddit', 0)
+    clock.advance(600)
+    assert quiet.record_poll('reddit', 0) == 3600
+    assert quiet.snapshot()['reddit']['reason'] == 'quiet'
+
+
+def test_spike_polls_at_min_interval():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock)
+    scheduler.record_poll('reddit', 0)
+    clock.advance(600)
+    assert scheduler.record_poll('reddit', 0, spike=True) == 60
+    decision = scheduler.snapshot()['reddit']
+    assert (decision['reason'], decision['spike']) == ('spike', True)
+
+
+def test_rate_limit_caps_the_cadence_unless_a_spike_has_saved_tokens():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1 / 900, capacity=3, clock=clock, sleep=clock.advance)
+    scheduler = make_scheduler(clock, rate_limiters={'reddit': bucket})
+
+    # Spikes may spend the saved-up burst while at least two tokens remain
+    bucket.acquire()
+    assert scheduler.record_poll('reddit', 0, spike=True) == 60
+
+    bucket.acquire()
+    assert scheduler.record_poll('reddit', 0, spike=True) == 900
+    decision = scheduler.snapshot()['reddit']
+    assert (decision['reason'], decision['budget_remaining']) == ('rate_limit', 1)
+
+    # Busy sources never poll faster than the bucket refills
+    bucket.acquire()
+    clock.advance(60)
+    assert scheduler.record_poll('reddit', 100) == 900
+    assert scheduler.snapshot()['reddit']['reason'] == 'rate_limit'
@@ -0,0 +1,60 @@
+import threading
+
+from refresher import BackgroundRefresher
+
+
+class CountingRefresh:
+    """Refresh function that blocks until released and tracks concurrent calls"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        self.release.wait(5)
+        with self.lock:
+            self.running -= 1
+        return self.calls
+
+
+def test_first_get_joins_a_running_refresh():
+    refresh = CountingRefresh()
+    refresher = BackgroundRefresher(refresh, ttl_seconds=60)
+
+    # A refresh requested before the first load, as when Refresh is pressed on a reconnect
+    assert refresher.refresh_async()
+    results = []
+    readers = [threading.Thread(target=lambda: results.append(refresher.get())) for _ in range(3)]
+    for reader in readers:
+        reader.start()
+    refresh.release.set()
+    for reader in readers:
+        reader.join(5)
+
+    assert results == [1, 1, 1]
+    assert refresh.calls == 1
+    assert refresh.max_running == 1
+
+
+def test_stale_snapshot_is_served_while_refreshing():
+    now = [0.0]
+    refresh = CountingRefresh()
+    refresh.release.set()
+    refresher = BackgroundRefresher(refresh, ttl_seconds=60, clock=lambda: now[0])
+    assert refresher.get() == 1
+
+    now[0] = 61.0
+    refresh.release.clear()
+    assert refresher.get() == 1
+    assert refresher.refreshing
+    refresh.release.set()
+    refresher.wait(5)
+    assert refresher.get() == 2
+    assert refresh.max_running == 1
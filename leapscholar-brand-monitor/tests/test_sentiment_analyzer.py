@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from sentiment_analyzer import SentimentAnalyzer
+
+
+@pytest.mark.parametrize('engine', ['vader_only', 'both', 'tiered'])
+def test_batch_matches_single_scoring(engine):
+    analyzer = SentimentAnalyzer(engine=engine)
+    analyzer.cache = None
+    texts = ["LeapScholar was amazing, loved it!", "Awful LeapScholar support", "LeapScholar has offices"]
+    results = analyzer.analyze_batch(texts)
+    for i, text in enumerate(texts):
+        single = analyzer.analyze_sentiment(text)
+        assert results['sentiment'][i] == single['sentiment']
+        assert results['compound'][i] == pytest.approx(single['compound'])
+        assert results['textblob_polarity'][i] == pytest.approx(single.get('textblob_polarity', np.nan), nan_ok=True)
+
+
+@pytest.mark.parametrize('engine', ['vader_only', 'both', 'tiered'])
+def test_textblob_columns_are_nan_for_empty_text(engine):
+    analyzer = SentimentAnalyzer(engine=engine)
+    results = analyzer.analyze_batch(["", None, "   "])
+    assert np.isnan(results['textblob_polarity']).all()
+    assert np.isnan(results['textblob_subjectivity']).all()
+    assert list(results['sentiment']) == ['neutral'] * 3
+    assert (results['compound'] == 0).all()